@@ -0,0 +1,80 @@
+"""
+Load throughput of Graph.from_edge_file, in edges per second.
+
+Writes a random edge list in every supported format (text, CSV, .npy, raw int32) to a
+temporary directory, then times loading each file and building the CSR adjacency view.
+Target: >= 1e6 edges/s for text files; binary files are memory-mapped, so their load
+time is independent of the file size and the CSR build dominates.
+
+Run from the repository root:
+    python -m benchmarks.bench_load --vertices 1000000 --edges 10000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from graph_base import Graph
+
+
+def write_edge_files(directory, src, dst):
+    """
+    Write the same edges as .txt, .csv, .npy and .bin files, returns {format name: path}.
+    """
+    edges = np.stack((src, dst), axis=1).astype(np.int32)
+    paths = {
+        "text": os.path.join(directory, "edges.txt"),
+        "csv": os.path.join(directory, "edges.csv"),
+        "npy": os.path.join(directory, "edges.npy"),
+        "bin": os.path.join(directory, "edges.bin"),
+    }
+    np.savetxt(paths["text"], edges, fmt="%d")
+    np.savetxt(paths["csv"], edges, fmt="%d", delimiter=",")
+    np.save(paths["npy"], edges)
+    edges.tofile(paths["bin"])
+    return paths
+
+
+def run(V, E, seed=0):
+    """
+    Returns a list of dicts, one per file format, with the load and CSR build times.
+    """
+    rng = np.random.default_rng(seed)
+    src = rng.integers(0, V, E)
+    dst = rng.integers(0, V, E)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_edge_files(directory, src, dst)
+        for name, path in paths.items():
+            start = time.perf_counter()
+            g = Graph.from_edge_file(path, V=V)
+            load_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            g.adjacency_list
+            build_time = time.perf_counter() - start
+
+            results.append({
+                "format": name,
+                "vertices": V,
+                "edges": E,
+                "file_bytes": os.path.getsize(path),
+                "load_seconds": load_time,
+                "csr_build_seconds": build_time,
+                "edges_per_second": E / (load_time + build_time),
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vertices", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for result in run(args.vertices, args.edges, args.seed):
+        print(f"{result['format']:>5}: load {result['load_seconds']:.3f}s + csr {result['csr_build_seconds']:.3f}s "
+              f"= {result['edges_per_second']:.0f} edges/s ({result['file_bytes'] / 1e6:.1f} MB)")
@@ -0,0 +1,78 @@
+"""
+Throughput of single-edge updates on graph_base.Graph.
+
+Builds a random graph, materializes the requested views, then applies a stream of single-edge updates (alternating add_edge
+and delete_edges of one random existing edge) and reports updates per second against the target (--target, 10^5 updates/s
+by default); the run fails if the target is missed. The target is for the default storage="list": the csr backend is
+not meant for single-edge streams (see GraphView), use Graph.batch() there.
+
+Run from the repository root:
+    python -m benchmarks.bench_mutation --vertices 100000 --edges 1000000 --updates 100000
+"""
+import argparse
+import random
+import time
+
+from graph_base import Graph
+
+
+def random_edges(V, E, rng):
+    return [(rng.randrange(V), rng.randrange(V)) for _ in range(E)]
+
+
+def run(V, E, updates, storage="list", views=("adjacency_list",), seed=0):
+    """
+    Returns a dict with the construction time and the update throughput.
+    views: names of the views (see GraphView.VIEWS) to build before the updates, so they are patched on every update
+    """
+    rng = random.Random(seed)
+    edges = random_edges(V, E, rng)
+
+    start = time.perf_counter()
+    g = Graph(V, E, edges, storage=storage)
+    for name in views:
+        g.get_view(name)
+    if storage == "list":
+        g.edge_slots  # the hash index used by deletes is built once, on first use
+    build_time = time.perf_counter() - start
+
+    new_edges = random_edges(V, updates, rng)
+    picks = [rng.random() for _ in range(updates)]  # drawn up front, so the timing is the graph's alone
+    edges_list = g.edges_list
+    start = time.perf_counter()
+    for i in range(updates):
+        if i % 2 == 0:
+            g.add_edge(new_edges[i])
+        else:
+            g.delete_edges([edges_list[int(picks[i] * len(edges_list))]])
+    update_time = time.perf_counter() - start
+
+    return {
+        "vertices": V,
+        "edges": E,
+        "updates": updates,
+        "storage": storage,
+        "views": list(views),
+        "build_seconds": build_time,
+        "update_seconds": update_time,
+        "updates_per_second": updates / update_time if update_time else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vertices", type=int, default=100000)
+    parser.add_argument("--edges", type=int, default=1000000)
+    parser.add_argument("--updates", type=int, default=100000)
+    parser.add_argument("--storage", default="list", choices=["list", "csr"])
+    parser.add_argument("--views", nargs="*", default=["adjacency_list"], choices=Graph.VIEWS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", type=float, default=1e5, help="updates/s the run must reach")
+    args = parser.parse_args()
+
+    result = run(args.vertices, args.edges, args.updates, args.storage, args.views, args.seed)
+    print(f"Built V={result['vertices']}, E={result['edges']} in {result['build_seconds']:.3f}s")
+    print(f"{result['updates']} single-edge updates in {result['update_seconds']:.3f}s: "
+          f"{result['updates_per_second']:.0f} updates/s (target {args.target:.0f})")
+    if result["updates_per_second"] < args.target:
+        raise SystemExit(f"Below the target of {args.target:.0f} updates/s")
@@ -0,0 +1,79 @@
+"""
+Scaling of the process-parallel GraphOps (workers > 1), in edges per second.
+
+Builds two random graphs sharing half of their edges, then runs union, intersection, difference and
+ringsum with 1, 2, 4, ... workers up to the core count and reports the throughput (input edges of both
+graphs per second) and the speedup over one worker. Expect near-linear speedup while the shards
+dominate; the packing and partitioning of the keys in the parent process is the serial part.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel --vertices 10000000 --edges 100000000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from graph_base import Graph
+from graph_ops import GraphOps
+
+
+def worker_counts(max_workers):
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def run(V, E, operations, max_workers, repeat=1, seed=0):
+    """
+    Returns a list of dicts, one per (operation, workers), with the best time and the speedup.
+    """
+    rng = np.random.default_rng(seed)
+    shared = (rng.integers(0, V, E // 2), rng.integers(0, V, E // 2))
+    graphs = []
+    for _ in range(2):
+        src = np.concatenate((shared[0], rng.integers(0, V, E - E // 2)))
+        dst = np.concatenate((shared[1], rng.integers(0, V, E - E // 2)))
+        graphs.append(Graph.from_arrays(src, dst, V=V))
+
+    ops = GraphOps()
+    results = []
+    for operation in operations:
+        single = None
+        for workers in worker_counts(max_workers):
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                getattr(ops, operation)(graphs[0], graphs[1], workers=workers)
+                times.append(time.perf_counter() - start)
+            seconds = min(times)
+            single = single or seconds
+            results.append({
+                "operation": operation,
+                "workers": workers,
+                "vertices": V,
+                "edges": E,
+                "seconds": seconds,
+                "edges_per_second": 2 * E / seconds,
+                "speedup": single / seconds,
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vertices", type=int, default=1000000)
+    parser.add_argument("--edges", type=int, default=10000000, help="edges per graph")
+    parser.add_argument("--operations", nargs="*", default=["union", "intersection", "difference", "ringsum"])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for result in run(args.vertices, args.edges, args.operations, args.max_workers, args.repeat, args.seed):
+        print(f"{result['operation']:>12} workers {result['workers']:>3}: {result['seconds']:.3f}s "
+              f"{result['edges_per_second']:.0f} edges/s speedup {result['speedup']:.2f}x")
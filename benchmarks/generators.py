@@ -0,0 +1,112 @@
+"""
+Random inputs for the benchmarks, all seeded so two runs measure the same work.
+"""
+import random
+
+
+def random_edges(V, E, rng, labels=None):
+    """
+    E random (u, v) edges over V vertices, without self loops.
+    labels: (default=None) if given, a third field drawn from this sequence is added to every edge
+    """
+    edges = []
+    for _ in range(E):
+        u = rng.randrange(V)
+        v = rng.randrange(V - 1)
+        v += v >= u  # skip u, so there is no self loop
+        if labels is None:
+            edges.append((u, v))
+        else:
+            edges.append((u, v, rng.choice(labels)))
+    return edges
+
+
+def random_simple_edges(V, E, rng):
+    """
+    E distinct undirected edges (u < v) over V vertices.
+    """
+    E = min(E, V * (V - 1) // 2)
+    edges = set()
+    while len(edges) < E:
+        u, v = rng.randrange(V), rng.randrange(V)
+        if u != v:
+            edges.add((min(u, v), max(u, v)))
+    return sorted(edges)
+
+
+def adjacency_dict(V, edges):
+    """
+    Undirected adjacency list as a dict {vertex: [neighbours]}, the input format of the algorithm modules.
+    """
+    graph = {v: [] for v in range(V)}
+    for u, v in edges:
+        graph[u].append(v)
+        graph[v].append(u)
+    return graph
+
+
+def random_graph_dict(V, average_degree, rng):
+    """
+    Random simple undirected graph with the given average degree, as an adjacency dict.
+    """
+    return adjacency_dict(V, random_simple_edges(V, V * average_degree // 2, rng))
+
+
+def random_connected_edges(V, extra_edges, rng, label=str):
+    """
+    Connected undirected graph: a random spanning tree plus extra_edges random edges.
+    label: (default=str) applied to every vertex id, e.g. str for 'A'-style string vertices
+    returns: (vertices, edges), the input format of cut_sets_a
+    """
+    edges = set()
+    for v in range(1, V):
+        edges.add((rng.randrange(v), v))
+    for u, v in random_simple_edges(V, extra_edges, rng):
+        edges.add((u, v))
+    vertices = [label(v) for v in range(V)]
+    return vertices, [(label(u), label(v)) for u, v in sorted(edges)]
+
+
+def random_rooted_tree(V, rng):
+    """
+    Random tree over vertices 1..V as (parent, child) pairs, rooted at 1.
+    """
+    return [[rng.randint(1, v - 1), v] for v in range(2, V + 1)]
+
+
+def random_prufer_code(V, rng):
+    return [rng.randint(1, V) for _ in range(V - 2)]
+
+
+def random_maze(n, rng, wall_density=0.25):
+    """
+    n x n grid maze (0 = free, 1 = wall) with the two corners free.
+    """
+    maze = [[1 if rng.random() < wall_density else 0 for _ in range(n)] for _ in range(n)]
+    maze[0][0] = 0
+    maze[n - 1][n - 1] = 0
+    return maze
+
+
+def random_tickets(n_airports, n_tickets, rng):
+    """
+    Flight tickets forming one walk that starts at JFK, so an itinerary using all of them exists.
+    """
+    airports = ["JFK"] + [f"A{i:05d}" for i in range(1, n_airports)]
+    tickets = []
+    at = "JFK"
+    for _ in range(n_tickets):
+        to = rng.choice(airports)
+        while to == at:
+            to = rng.choice(airports)
+        tickets.append([at, to])
+        at = to
+    rng.shuffle(tickets)
+    return tickets
+
+
+def seeded(seed, size):
+    """
+    A random generator for one (seed, size) pair.
+    """
+    return random.Random(seed * 1000003 + size)
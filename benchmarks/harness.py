@@ -0,0 +1,94 @@
+"""
+Timing, peak memory and JSON result files for the benchmark suite.
+"""
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+
+def measure(setup, run, repeat=3, memory=True):
+    """
+    Time run(*setup()) and measure its peak memory.
+    setup: callable returning the arguments of run, called again before every repetition (not timed)
+    run: the measured callable
+    repeat: (default=3) number of timed runs, the fastest one is reported
+    memory: (default=True) one extra run under tracemalloc for the peak allocated memory.
+            It is a separate run because tracemalloc slows the code down.
+    returns: dict with seconds (best), mean_seconds and peak_bytes (None if memory is False)
+    """
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(*args)
+        times.append(time.perf_counter() - start)
+        del args
+
+    peak = None
+    if memory:
+        args = setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        del args
+
+    return {
+        "seconds": min(times),
+        "mean_seconds": sum(times) / len(times),
+        "peak_bytes": peak,
+    }
+
+
+def environment():
+    """
+    Where the results were measured, stored with every result file.
+    """
+    import numpy
+    return {
+        "python": sys.version.split()[0],
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def write_results(path, results, options):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "options": options, "results": results}, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(baseline, current, threshold=1.25):
+    """
+    Compare two result lists, matching entries on (kernel, size).
+    threshold: (default=1.25) a kernel is a regression if it is this many times slower (or uses this much
+               more peak memory) than in the baseline
+    returns: list of (kernel, size, time ratio, memory ratio or None, is_regression)
+    """
+    base = {(r["kernel"], r["size"]): r for r in baseline}
+    rows = []
+    for result in current:
+        old = base.get((result["kernel"], result["size"]))
+        if old is None:
+            continue
+        time_ratio = result["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        memory_ratio = None
+        if result.get("peak_bytes") and old.get("peak_bytes"):
+            memory_ratio = result["peak_bytes"] / old["peak_bytes"]
+        regression = time_ratio > threshold or (memory_ratio is not None and memory_ratio > threshold)
+        rows.append((result["kernel"], result["size"], time_ratio, memory_ratio, regression))
+    return rows
@@ -0,0 +1,401 @@
+"""
+Benchmark suite: graph construction, mutation, GraphOps and the algorithm modules.
+
+Every kernel runs over generated inputs of increasing size (10^2 to 10^6 where the algorithm
+can handle it, smaller sizes for the exponential ones), records the best wall time and the
+peak memory (tracemalloc), and writes the results as JSON. A previous result file can be
+passed with --compare to flag regressions.
+
+Run from the repository root:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --max-size 1000000 --output full.json
+    python -m benchmarks.suite --kernels graph_ops --compare results.json
+"""
+import argparse
+import importlib.util
+import math
+import os
+import sys
+import tempfile
+
+from benchmarks import generators
+from benchmarks.harness import measure, write_results, load_results, compare
+
+import chromatic_number
+import cut_sets_a
+import cut_sets_karger
+import maximum_clique
+import maze_solver
+import prufer_code
+from graph_base import Graph
+from graph_ops import GraphOps
+
+
+def load_itinerary_module():
+    # the module file name has a space in it, so it cannot be imported by name
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reconstruct itenary.py")
+    spec = importlib.util.spec_from_file_location("reconstruct_itenary", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+SIZES = (100, 1000, 10000, 100000, 1000000)
+AVERAGE_DEGREE = 8
+
+# name -> (sizes, setup). setup(size, rng) returns (run, args): run(*args) is the measured call
+KERNELS = dict()
+
+
+def kernel(name, sizes=SIZES):
+    def register(setup):
+        KERNELS[name] = (sizes, setup)
+        return setup
+    return register
+
+
+# ---------------- graph_base ----------------
+
+@kernel("graph_base.construct_list")
+def construct_list(size, rng):
+    edges = generators.random_edges(size, size * AVERAGE_DEGREE // 2, rng)
+
+    def run(edges):
+        Graph(size, len(edges), edges).adjacency_list
+    return run, (edges,)
+
+
+@kernel("graph_base.construct_csr")
+def construct_csr(size, rng):
+    edges = generators.random_edges(size, size * AVERAGE_DEGREE // 2, rng)
+
+    def run(edges):
+        Graph(size, len(edges), edges, storage="csr").adjacency_list
+    return run, (edges,)
+
+
+@kernel("graph_base.adjacency_matrix", sizes=(100, 1000))
+def adjacency_matrix(size, rng):
+    g = Graph(size, size * 2, generators.random_edges(size, size * 2, rng))
+    return (lambda g: g.adjacency_matrix), (g,)
+
+
+@kernel("graph_base.incidence_matrix")
+def incidence_matrix(size, rng):
+    g = Graph(size, size * 2, generators.random_edges(size, size * 2, rng))
+    return (lambda g: g.incidence_matrix), (g,)
+
+
+@kernel("graph_base.add_edges")
+def add_edges(size, rng):
+    g = Graph(size, size * 2, generators.random_edges(size, size * 2, rng))
+    g.adjacency_list
+    new_edges = generators.random_edges(size, size, rng)
+    return (lambda g, edges: g.add_edges(edges)), (g, new_edges)
+
+
+@kernel("graph_base.delete_edges")
+def delete_edges(size, rng):
+    g = Graph(size, size * 2, generators.random_edges(size, size * 2, rng))
+    g.adjacency_list
+    g.edge_slots
+    del_edges = rng.sample(g.edges_list, size // 10)
+    return (lambda g, edges: g.delete_edges(edges)), (g, del_edges)
+
+
+_snapshot_directory = None
+
+
+def snapshot_path(name):
+    global _snapshot_directory
+    if _snapshot_directory is None:
+        _snapshot_directory = tempfile.TemporaryDirectory()
+    return os.path.join(_snapshot_directory.name, name)
+
+
+@kernel("graph_base.save")
+def save_snapshot(size, rng):
+    g = Graph(size, size * AVERAGE_DEGREE // 2, generators.random_edges(size, size * AVERAGE_DEGREE // 2, rng),
+              storage="csr")
+    g.adjacency_list
+    return (lambda g, path: g.save(path)), (g, snapshot_path(f"save_{size}.snap"))
+
+
+@kernel("graph_base.load")
+def load_snapshot(size, rng):
+    path = snapshot_path(f"load_{size}.snap")
+    if not os.path.exists(path):
+        edges = generators.random_edges(size, size * AVERAGE_DEGREE // 2, rng)
+        g = Graph(size, len(edges), edges, storage="csr")
+        g.adjacency_list
+        g.save(path)
+
+    def run(path):
+        Graph.load(path).adjacency_list
+    return run, (path,)
+
+
+# ---------------- graph_ops ----------------
+
+def graph_ops_inputs(size, rng):
+    """
+    Two labelled graphs over the same vertices sharing about half of their edges.
+    """
+    shared = generators.random_edges(size, size, rng, labels="ab")
+    g1 = Graph(size, 2 * size, shared + generators.random_edges(size, size, rng, labels="ab"), is_labelled=True)
+    g2 = Graph(size, 2 * size, shared + generators.random_edges(size, size, rng, labels="ab"), is_labelled=True)
+    g1.adjacency_list
+    g2.adjacency_list
+    return g1, g2
+
+
+def graph_ops_kernel(operation):
+    def setup(size, rng):
+        g1, g2 = graph_ops_inputs(size, rng)
+        if operation == "fusion":
+            return (lambda g1, g2: GraphOps().fusion(g1, g2, 0, 1)), (g1, g2)
+        return (lambda g1, g2: getattr(GraphOps(), operation)(g1, g2)), (g1, g2)
+    return setup
+
+
+for _operation in ("union", "intersection", "difference", "ringsum", "fusion"):
+    kernel(f"graph_ops.{_operation}", sizes=SIZES[:4])(graph_ops_kernel(_operation))
+
+
+@kernel("graph_ops.ringsum_composed", sizes=SIZES[:4])
+def ringsum_composed(size, rng):
+    # the ring sum as it used to be computed, to compare with the single pass GraphOps.ringsum
+    g1, g2 = graph_ops_inputs(size, rng)
+
+    def run(g1, g2):
+        ops = GraphOps()
+        return ops.difference(ops.union(g1, g2), ops.intersection(g1, g2))
+    return run, (g1, g2)
+
+
+@kernel("graph_ops.chain_eager", sizes=SIZES[:4])
+def chain_eager(size, rng):
+    g1, g2 = graph_ops_inputs(size, rng)
+    return (lambda g1, g2: GraphOps().fusion(GraphOps().ringsum(g1, g2), g1, 0, 1)), (g1, g2)
+
+
+@kernel("graph_ops.chain_lazy", sizes=SIZES[:4])
+def chain_lazy(size, rng):
+    # same chain with overlays: one materialization at the end
+    g1, g2 = graph_ops_inputs(size, rng)
+    return (lambda g1, g2: GraphOps().fusion(GraphOps().ringsum(g1, g2, lazy=True), g1, 0, 1)), (g1, g2)
+
+
+@kernel("graph_ops.overlay_neighbors", sizes=SIZES[:4])
+def overlay_neighbors(size, rng):
+    # a few neighbourhood queries on a lazy union, without building it
+    g1, g2 = graph_ops_inputs(size, rng)
+    vertices = [rng.randrange(size) for _ in range(100)]
+
+    def run(g1, g2, vertices):
+        overlay = GraphOps().union(g1, g2, lazy=True)
+        return [overlay.neighbors(v) for v in vertices]
+    return run, (g1, g2, vertices)
+
+
+@kernel("graph_ops.contract", sizes=SIZES[:4])
+def contract(size, rng):
+    # size // 10 vertex pairs merged in one call
+    g1, _ = graph_ops_inputs(size, rng)
+    pairs = [(rng.randrange(size), rng.randrange(size)) for _ in range(size // 10)]
+    return (lambda g, pairs: GraphOps().contract(g, pairs)), (g1, pairs)
+
+
+def snapshot_graphs(size, rng, n_graphs=8):
+    """
+    n_graphs labelled graphs over the same vertices, like daily snapshots: a shared core plus their own edges.
+    """
+    core = generators.random_edges(size, size, rng, labels="ab")
+    graphs = []
+    for _ in range(n_graphs):
+        edges = core + generators.random_edges(size, size, rng, labels="ab")
+        graphs.append(Graph(size, len(edges), edges, is_labelled=True, storage="csr"))
+    return graphs
+
+
+@kernel("graph_ops.union_many", sizes=SIZES[:4])
+def union_many(size, rng):
+    graphs = snapshot_graphs(size, rng)
+    return (lambda graphs: GraphOps().union_many(graphs, min_count=2)), (graphs,)
+
+
+@kernel("graph_ops.union_pairwise", sizes=SIZES[:4])
+def union_pairwise(size, rng):
+    # the reduction union_many replaces: N-1 intermediate graphs
+    graphs = snapshot_graphs(size, rng)
+
+    def run(graphs):
+        ops = GraphOps()
+        result = graphs[0]
+        for g in graphs[1:]:
+            result = ops.union(result, g)
+        return result
+    return run, (graphs,)
+
+
+# ---------------- algorithm modules ----------------
+
+@kernel("maximum_clique.find_maximal_clique", sizes=(100, 1000, 10000))
+def find_maximal_clique(size, rng):
+    graph = generators.random_graph_dict(size, AVERAGE_DEGREE, rng)
+    return maximum_clique.find_maximal_clique, (graph,)
+
+
+@kernel("maximum_clique.iter_maximal_cliques", sizes=(100, 1000, 10000))
+def iter_maximal_cliques(size, rng):
+    graph = generators.random_graph_dict(size, AVERAGE_DEGREE, rng)
+    return (lambda graph: sum(1 for _ in maximum_clique.iter_maximal_cliques(graph))), (graph,)
+
+
+@kernel("chromatic_number.chromatic_number", sizes=(100, 1000, 10000))
+def chromatic(size, rng):
+    graph = generators.random_graph_dict(size, 3, rng)
+    return chromatic_number.chromatic_number, (graph,)
+
+
+def heuristic_coloring_kernel(method):
+    def setup(size, rng):
+        g = Graph(size, size * AVERAGE_DEGREE // 2, generators.random_edges(size, size * AVERAGE_DEGREE // 2, rng),
+                  storage="csr")
+        return (lambda csr: chromatic_number.heuristic_coloring(csr, method)), (g.adjacency_list,)
+    return setup
+
+
+for method in ("welsh_powell", "smallest_last", "dsatur"):
+    kernel(f"chromatic_number.heuristic_coloring.{method}")(heuristic_coloring_kernel(method))
+
+
+@kernel("cut_sets_karger.karger_min_cut", sizes=(100, 1000, 10000))
+def karger(size, rng):
+    # Karger's contraction needs a connected graph (no isolated vertex)
+    _, edges = generators.random_connected_edges(size, size, rng, label=int)
+    graph = generators.adjacency_dict(size, edges)
+    return (lambda graph: cut_sets_karger.karger_min_cut(graph, iterations=10, seed=0)), (graph,)
+
+
+@kernel("cut_sets_karger.stoer_wagner", sizes=(100, 300, 1000))
+def stoer_wagner(size, rng):
+    _, edges = generators.random_connected_edges(size, size * AVERAGE_DEGREE // 2, rng, label=int)
+    edges = [(u, v, rng.randint(1, 9)) for u, v in edges]
+    graph = Graph(size, len(edges), edges, is_weighted=True)
+    return cut_sets_karger.min_cut, (graph,)
+
+
+@kernel("cut_sets_karger.karger_stein", sizes=(100, 300))
+def karger_stein(size, rng):
+    _, edges = generators.random_connected_edges(size, size, rng, label=int)
+    graph = generators.adjacency_dict(size, edges)
+    return (lambda graph: cut_sets_karger.karger_min_cut(graph, iterations=3, method="karger_stein", seed=0)), (graph,)
+
+
+@kernel("cut_sets_a.find_articulation_points")
+def articulation_points(size, rng):
+    vertices, edges = generators.random_connected_edges(size, size // 2, rng)
+    return cut_sets_a.find_articulation_points, (vertices, edges)
+
+
+@kernel("cut_sets_a.find_biconnected_components")
+def biconnected_components(size, rng):
+    vertices, edges = generators.random_connected_edges(size, size // 2, rng)
+    return cut_sets_a.find_biconnected_components, (vertices, edges)
+
+
+@kernel("cut_sets_a.find_cut_sets", sizes=(8, 12, 16))
+def cut_sets(size, rng):
+    # size is the number of edges: the power set of the edges is enumerated
+    vertices, edges = generators.random_connected_edges(size // 2 + 1, size // 2, rng)
+    return cut_sets_a.find_cut_sets, (vertices, edges[:size])
+
+
+@kernel("cut_sets_a.iter_bonds", sizes=(100, 300))
+def bonds(size, rng):
+    vertices, edges = generators.random_connected_edges(size, size // 2, rng)
+    def run(vertices, edges):
+        return sum(1 for _ in cut_sets_a.iter_bonds(vertices, edges, max_size=2))
+    return run, (vertices, edges)
+
+
+@kernel("prufer_code.prufer_to_tree")
+def prufer_to_tree(size, rng):
+    return prufer_code.prufer_to_tree, (size, generators.random_prufer_code(size, rng))
+
+
+@kernel("prufer_code.tree_to_pruffer", sizes=(100, 1000))
+def tree_to_pruffer(size, rng):
+    return prufer_code.tree_to_pruffer, (size, generators.random_rooted_tree(size, rng))
+
+
+@kernel("maze_solver.bfs_maze_solver")
+def maze(size, rng):
+    # size is the number of cells
+    n = math.isqrt(size)
+    return maze_solver.bfs_maze_solver, (generators.random_maze(n, rng), (0, 0), (n - 1, n - 1))
+
+
+@kernel("reconstruct_itenary.findItinerary", sizes=(100, 500))
+def itinerary(size, rng):
+    # size is the number of tickets; the solver recurses once per ticket
+    solution = load_itinerary_module().Solution()
+    tickets = generators.random_tickets(max(size // 4, 2), size, rng)
+    return solution.findItinerary, (tickets,)
+
+
+def run_suite(names, max_size, repeat, memory, seed=0):
+    results = []
+    for name in names:
+        sizes, setup = KERNELS[name]
+        for size in sizes:
+            if size > max_size:
+                continue
+
+            def make_args():
+                run, args = setup(size, generators.seeded(seed, size))
+                return (run,) + tuple(args)
+
+            result = measure(make_args, lambda run, *args: run(*args), repeat=repeat, memory=memory)
+            result.update({"kernel": name, "size": size})
+            results.append(result)
+            peak = "-" if result["peak_bytes"] is None else f"{result['peak_bytes'] / 1e6:.1f} MB"
+            print(f"{name:<40} {size:>8} {result['seconds']:>10.4f}s {peak:>12}", flush=True)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json", help="JSON result file")
+    parser.add_argument("--kernels", nargs="*", default=[], help="only run kernels whose name contains one of these")
+    parser.add_argument("--max-size", type=int, default=10000, help="skip sizes above this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", help="previous JSON result file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument("--list", action="store_true", help="list the kernels and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (sizes, _) in KERNELS.items():
+            print(f"{name:<40} sizes {', '.join(map(str, sizes))}")
+        sys.exit(0)
+
+    names = [name for name in KERNELS if not args.kernels or any(k in name for k in args.kernels)]
+    results = run_suite(names, args.max_size, args.repeat, not args.no_memory, args.seed)
+    write_results(args.output, results, vars(args))
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        rows = compare(load_results(args.compare), results, args.threshold)
+        regressions = 0
+        for name, size, time_ratio, memory_ratio, regression in rows:
+            memory = "-" if memory_ratio is None else f"{memory_ratio:.2f}x"
+            flag = "  REGRESSION" if regression else ""
+            print(f"{name:<40} {size:>8} time {time_ratio:.2f}x memory {memory}{flag}")
+            regressions += regression
+        if regressions:
+            print(f"{regressions} regression(s) above {args.threshold}x")
+            sys.exit(1)
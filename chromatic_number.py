@@ -1,4 +1,11 @@
-from maximum_clique import find_maximal_clique
+import heapq
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from maximum_clique import find_maximal_clique, index_graph, degeneracy_order
+from graph_storage import CSRAdjacency
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 
@@ -57,40 +64,709 @@ def is_m_colorable(graph, m):
         return True, color_assignment
     return False, None
 
-graph = {
-        0: [1, 2, 3, 4],  # Central vertex
-        1: [0, 2, 4],     # Cycle: 1-2-3-4-1
-        2: [0, 1, 3],
-        3: [0, 2, 4],
-        4: [0, 1, 3]
-    }
-petersen_graph = {
-        0: [1, 4, 5],
-        1: [0, 2, 6],
-        2: [1, 3, 7],
-        3: [2, 4, 8],
-        4: [0, 3, 9],
-        5: [0, 7, 8],
-        6: [1, 8, 9],
-        7: [2, 5, 9],
-        8: [3, 5, 6],
-        9: [4, 6, 7]
+def greedy_coloring(neighbors, order, colors=None):
+    """
+    First-fit coloring: every vertex, in the given order, takes the smallest color none of its
+    colored neighbours has. O(V+E).
+    Args:
+        neighbors (list): neighbour sets of the vertices 0..n-1.
+        order (list): the vertices in coloring order.
+        colors (list): colors already assigned (-1: uncolored), completed in place. Default: none.
+    Returns:
+        list: color of every vertex.
+    """
+    if colors is None:
+        colors = [-1] * len(neighbors)
+    for v in order:
+        taken = {colors[u] for u in neighbors[v]}
+        c = 0
+        while c in taken:
+            c += 1
+        colors[v] = c
+    return colors
+
+
+def dsatur_coloring(neighbors):
+    """
+    Greedy DSATUR over neighbour sets, see dsatur_greedy.
+    Args:
+        neighbors (list): neighbour sets of the vertices 0..n-1.
+    Returns:
+        list: color of every vertex.
+    """
+    return dsatur_greedy(*flatten(neighbors))
+
+
+def dsatur_branch_and_bound(neighbors, clique, upper_coloring, lower=0, prefix=(), bound=None):
+    """
+    Exact coloring by DSATUR branch and bound: always branch on the uncolored vertex with the most distinct
+    colors among its neighbours (saturation; ties: most uncolored neighbours), trying its free colors and one
+    new color.
+    There is a single search for all numbers of colors: every complete coloring found lowers the bound to
+    beat, and the branches that would need as many colors are cut.
+    The clique is colored 0..k-1 first (k is a lower bound, and this removes the color permutations), the
+    saturations are updated incrementally with per-vertex color counts, and the recursion is an explicit
+    stack so deep searches do not hit the recursion limit.
+    With a prefix only the subtree below those assignments is searched (see parallel_branch_and_bound), and
+    with a bound the number of colors to beat is shared with other searches and a deadline is honoured:
+    both are checked every 1024 search nodes.
+    Args:
+        neighbors (list): neighbour sets of the vertices 0..n-1.
+        clique (list): vertices of a clique.
+        upper_coloring (list): a valid coloring (e.g. greedy), the bound to beat.
+        lower (int): stop as soon as a coloring with this many colors (or the clique size) is found.
+        prefix (list): (vertex, color) assignments made after the clique, the root of the subtree to search.
+        bound (SearchBound): shared number of colors to beat and deadline, None for a standalone search.
+    Returns:
+        list: color of every vertex in an optimal coloring (or one with at most lower colors). With a bound,
+              the best coloring this search found (else upper_coloring), and bound.interrupted tells whether
+              the deadline cut the search short.
+    """
+    n = len(neighbors)
+    lower = max(lower, len(clique))
+    best_colors = list(upper_coloring)
+    best = max(best_colors, default=-1) + 1
+    size = best  # colors are always below the first bound
+    if bound is not None:
+        best = min(best, bound.get())
+    if best <= lower:
+        return best_colors
+
+    colors = [-1] * n
+    counts = [[0] * size for _ in range(n)]  # counts[v][c]: neighbours of v with color c
+    saturation = [0] * n
+    degree = [len(adjacent) for adjacent in neighbors]  # number of uncolored neighbours
+
+    def assign(v, c):
+        colors[v] = c
+        for u in neighbors[v]:
+            if counts[u][c] == 0:
+                saturation[u] += 1
+            counts[u][c] += 1
+            degree[u] -= 1
+
+    def unassign(v, c):
+        colors[v] = -1
+        for u in neighbors[v]:
+            counts[u][c] -= 1
+            if counts[u][c] == 0:
+                saturation[u] -= 1
+            degree[u] += 1
+
+    for c, v in enumerate(clique):
+        assign(v, c)
+    uncolored = set(range(n)) - set(clique)
+    used = lower
+    for v, c in prefix:
+        assign(v, c)
+        uncolored.remove(v)
+        used = max(used, c + 1)
+    stack = []  # frames [vertex, color options, index of the current option, colors used before it]
+    steps = 0
+
+    while True:
+        if bound is not None:
+            steps += 1
+            if steps & 1023 == 0:
+                best = min(best, bound.get())
+                if best <= lower or bound.expired():
+                    break
+        options = []
+        if not uncolored:
+            if used < best:
+                best = used
+                best_colors = list(colors)
+                if bound is not None:
+                    bound.offer(best)
+                if best <= lower:
+                    break  # the clique proves it optimal
+        else:
+            v = max(uncolored, key=lambda u: (saturation[u], degree[u]))
+            if saturation[v] < best - 1:  # else no color below best - 1 is free
+                options = [c for c in range(min(used, best - 1)) if counts[v][c] == 0]
+                if used < best - 1:
+                    options.append(used)
+        if options:
+            uncolored.remove(v)
+            stack.append([v, options, 0, used])
+            assign(v, options[0])
+            used = max(used, options[0] + 1)
+            continue
+
+        # backtrack to the deepest frame with another option that can still beat the bound
+        while stack:
+            frame = stack[-1]
+            v, options, i, used = frame
+            unassign(v, options[i])
+            i += 1
+            if i < len(options) and options[i] < best - 1:
+                frame[2] = i
+                assign(v, options[i])
+                used = max(used, options[i] + 1)
+                break
+            stack.pop()
+            uncolored.add(v)
+        else:
+            break  # search space exhausted: best is optimal
+    return best_colors
+
+
+def components(neighbors, vertices):
+    """
+    Connected components of the subgraph induced by vertices (a set), as lists.
+    """
+    seen = set()
+    result = []
+    for start in vertices:
+        if start in seen:
+            continue
+        seen.add(start)
+        component = [start]
+        for v in component:
+            for u in neighbors[v]:
+                if u in vertices and u not in seen:
+                    seen.add(u)
+                    component.append(u)
+        result.append(component)
+    return result
+
+
+def color_components(graph, solve):
+    """
+    The exact coloring pipeline. The size k of the maximum clique is a lower bound. A vertex with fewer than
+    k neighbours can always be colored last, so they are peeled off (the vertices outside the k-core) and
+    colored greedily at the end. Every connected component of the k-core is solved on its own: the best of
+    two greedy colorings (smallest-last and DSATUR) is its upper bound, solve closes the gap, and it may stop
+    as soon as the component needs no more colors than the others.
+    Args:
+        graph (dict): Graph as an adjacency list.
+        solve (function): solve(neighbors, clique, upper_coloring, lower) -> (colors, proven), proven is False
+                          if the coloring of the component may not be optimal.
+    Returns:
+        tuple: (coloring, lower, upper) - color assignment dict and bounds on the chromatic number
+               (equal when every component was solved).
+    """
+    vertices, neighbors = index_graph(graph)
+    if not vertices:
+        return {}, 0, 0
+    index = {v: i for i, v in enumerate(vertices)}
+    clique = [index[v] for v in find_maximal_clique(graph)]
+    best = len(clique)
+    order, core = degeneracy_order(neighbors)
+    kept = {v for v in range(len(vertices)) if core[v] >= best}
+
+    colors = [-1] * len(vertices)
+    all_proven = True
+    for component in sorted(components(neighbors, kept), key=len, reverse=True):
+        # renumber the component 0..k-1
+        local_index = {v: i for i, v in enumerate(component)}
+        local_neighbors = [{local_index[u] for u in neighbors[v] if u in local_index} for v in component]
+        local_clique = [local_index[v] for v in clique] if all(v in local_index for v in clique) else []
+        local_order, _ = degeneracy_order(local_neighbors)
+        upper_coloring = min(greedy_coloring(local_neighbors, local_order[::-1]), dsatur_coloring(local_neighbors),
+                             key=lambda colors: max(colors))
+        local_colors, proven = solve(local_neighbors, local_clique, upper_coloring, best)
+        all_proven = all_proven and proven
+        best = max(best, max(local_colors) + 1)
+        for v, c in zip(component, local_colors):
+            colors[v] = c
+
+    # the peeled vertices, in reverse peeling order, have fewer than k colored neighbours each
+    greedy_coloring(neighbors, [v for v in reversed(order) if v not in kept], colors)
+    upper = max(colors) + 1
+    return {v: colors[i] for i, v in enumerate(vertices)}, (upper if all_proven else len(clique)), upper
+
+
+def chromatic_number(graph):
+    """
+    Find the chromatic number: the smallest m for which the graph is m-colorable.
+    Every component of the graph's k-core (k: maximum clique size) is solved by a DSATUR branch and bound
+    search, see color_components and dsatur_branch_and_bound.
+    Args:
+        graph (dict): Graph as an adjacency list.
+    Returns:
+        tuple: (int, dict) - The chromatic number and an optimal color assignment.
+    """
+    coloring, _, upper = color_components(graph, lambda *args: (dsatur_branch_and_bound(*args), True))
+    return upper, coloring
+
+# ---------------- parallel exact search ----------------
+
+class SearchBound():
+    """
+    The number of colors to beat, shared by the processes searching parts of one branch and bound tree
+    (a multiprocessing.Value), and the wall-clock deadline of the search.
+    """
+
+    def __init__(self, best, deadline=None, shared=None):
+        """
+        best: number of colors of the best known coloring
+        deadline: (default=None) time.time() at which the search stops, None for no limit
+        shared: (default=None) multiprocessing.Value("i") holding the bound, a new one if None
+        """
+        self.shared = shared if shared is not None else multiprocessing.Value("i", best)
+        self.deadline = deadline
+        self.interrupted = False
+
+    def get(self):
+        return self.shared.value
+
+    def offer(self, best):
+        """
+        Lower the shared bound to best, if that beats it.
+        """
+        with self.shared.get_lock():
+            if best < self.shared.value:
+                self.shared.value = best
+
+    def expired(self):
+        """
+        True once the deadline has passed (and the search is then marked interrupted).
+        """
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.interrupted = True
+        return self.interrupted
+
+
+def split_search(neighbors, clique, upper_coloring, lower, n_tasks):
+    """
+    Expand the top of the DSATUR search tree breadth first, branching like dsatur_branch_and_bound (most
+    saturated vertex, its free colors and one new color), until there are at least n_tasks open subtrees.
+    Only the colored vertices' neighbourhoods are scanned per node, the other vertices are taken in
+    decreasing degree order.
+    Returns:
+        tuple: (tasks, best_colors) - the prefixes (lists of (vertex, color)) of the open subtrees, in the
+               order the serial search would visit them, and the best coloring found on the way.
+    """
+    lower = max(lower, len(clique))
+    best_colors = list(upper_coloring)
+    best = max(best_colors) + 1
+    by_degree = sorted(range(len(neighbors)), key=lambda v: len(neighbors[v]), reverse=True)
+    frontier = [[]]
+    while frontier and len(frontier) < n_tasks and best > lower:
+        expanded = []
+        for prefix in frontier:
+            colors = dict(zip(clique, range(len(clique))))
+            colors.update(prefix)
+            used = max([lower] + [c + 1 for _, c in prefix])
+            if len(colors) == len(neighbors):
+                if used < best:
+                    best, best_colors = used, [colors[v] for v in range(len(neighbors))]
+                continue
+            around, colored_degree = dict(), dict()  # neighbour colors, colored neighbours
+            for w, c in colors.items():
+                for u in neighbors[w]:
+                    if u not in colors:
+                        around.setdefault(u, set()).add(c)
+                        colored_degree[u] = colored_degree.get(u, 0) + 1
+            untouched = next((u for u in by_degree if u not in colors and u not in around), None)
+            candidates = list(around) + ([untouched] if untouched is not None else [])
+            v = max(candidates, key=lambda u: (len(around.get(u, ())), len(neighbors[u]) - colored_degree.get(u, 0)))
+            if len(around.get(v, ())) >= best - 1:
+                continue  # no color below best - 1 is free
+            options = [c for c in range(min(used, best - 1)) if c not in around.get(v, ())]
+            if used < best - 1:
+                options.append(used)
+            expanded.extend(prefix + [(v, c)] for c in options)
+        frontier = expanded
+    return (frontier if best > lower else []), best_colors
+
+
+# state of a pool worker of parallel_branch_and_bound, set once per process by init_subtree_search
+SUBTREE_SEARCH = dict()
+
+
+def init_subtree_search(neighbors, clique, upper_coloring, lower, shared, deadline):
+    SUBTREE_SEARCH.update(neighbors=neighbors, clique=clique, upper_coloring=upper_coloring, lower=lower,
+                          bound=SearchBound(0, deadline, shared))
+
+
+def search_subtree(prefix):
+    """
+    Pool task: branch and bound below prefix against the shared bound.
+    Returns:
+        tuple: (colors, complete) - the best coloring found (else the initial one) and False if the deadline
+               cut the search short.
+    """
+    search = SUBTREE_SEARCH
+    colors = dsatur_branch_and_bound(search["neighbors"], search["clique"], search["upper_coloring"],
+                                     search["lower"], prefix, search["bound"])
+    return colors, not search["bound"].interrupted
+
+
+def parallel_branch_and_bound(neighbors, clique, upper_coloring, lower=0, workers=None, deadline=None,
+                              tasks_per_worker=16):
+    """
+    dsatur_branch_and_bound split over a process pool: the top of the search tree is expanded into about
+    workers * tasks_per_worker subtrees (see split_search), searched in the serial order by the pool. Every
+    coloring found lowers the bound shared by all workers, so they prune as if they were one search. Once a
+    coloring with lower colors (the clique size, or the colors the other components need) is found, the
+    queued subtrees are cancelled and the running ones stop at their next bound check; at the deadline too.
+    Args:
+        neighbors (list): neighbour sets of the vertices 0..n-1.
+        clique (list): vertices of a clique.
+        upper_coloring (list): a valid coloring, the bound to beat.
+        lower (int): stop as soon as a coloring with this many colors is found.
+        workers (int): number of processes, default os.cpu_count(). 1 runs the serial search.
+        deadline (float): time.time() at which the search stops, None for no limit.
+    Returns:
+        tuple: (colors, proven) - the best coloring found, and whether it is proven optimal (or has at most
+               lower colors).
+    """
+    workers = workers or os.cpu_count()
+    lower = max(lower, len(clique))
+    if workers == 1:
+        bound = SearchBound(max(upper_coloring) + 1, deadline)
+        colors = dsatur_branch_and_bound(neighbors, clique, upper_coloring, lower, bound=bound)
+        return colors, not bound.interrupted
+
+    tasks, best_colors = split_search(neighbors, clique, upper_coloring, lower, workers * tasks_per_worker)
+    if not tasks:
+        return best_colors, True
+    shared = multiprocessing.Value("i", max(best_colors) + 1)
+    proven = True
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_subtree_search,
+                             initargs=(neighbors, clique, best_colors, lower, shared, deadline)) as pool:
+        pending = {pool.submit(search_subtree, prefix) for prefix in tasks}
+        while pending and max(best_colors) + 1 > lower:
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break  # out of time: the running workers stop at their next bound check
+            for future in done:
+                colors, complete = future.result()
+                best_colors = min(best_colors, colors, key=max)
+                proven = proven and complete
+        for future in pending:
+            future.cancel()
+    # subtrees that were running when the loop stopped
+    for future in pending:
+        if not future.cancelled():
+            colors, complete = future.result()
+            best_colors = min(best_colors, colors, key=max)
+            proven = proven and complete
+        else:
+            proven = False
+    return best_colors, proven or max(best_colors) + 1 <= lower
+
+
+def parallel_chromatic_number(graph, workers=None, time_limit=None):
+    """
+    chromatic_number with the branch and bound search of every component split over a process pool (see
+    parallel_branch_and_bound), within an optional wall-clock budget.
+    Args:
+        graph (dict): Graph as an adjacency list.
+        workers (int): number of processes, default os.cpu_count().
+        time_limit (float): seconds for the whole search, None for no limit. When it runs out, the best
+                            coloring found so far is returned with the clique size as lower bound.
+    Returns:
+        tuple: (coloring, lower, upper) - a color assignment dict with upper colors, and lower <= chromatic
+               number <= upper (lower == upper: it is optimal).
+    """
+    deadline = None if time_limit is None else time.time() + time_limit
+
+    def solve(neighbors, clique, upper_coloring, lower):
+        return parallel_branch_and_bound(neighbors, clique, upper_coloring, lower, workers, deadline)
+    return color_components(graph, solve)
+
+# ---------------- heuristic colorings for large graphs ----------------
+# They work on a CSR adjacency held in two flat Python lists (offsets, targets): the neighbours of v are
+# targets[offsets[v]:offsets[v + 1]]. Plain lists are faster than NumPy arrays for per-vertex loops.
+
+def flatten(neighbors):
+    """
+    CSR lists (offsets, targets) of a list of neighbour collections.
+    """
+    offsets, targets = [0], []
+    for adjacent in neighbors:
+        targets.extend(adjacent)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+def adjacency_arrays(graph):
+    """
+    CSR adjacency of an adjacency dict, a Graph object (from graph_base.py, directed graphs are made undirected)
+    or a CSRAdjacency (from graph_storage.py).
+    Returns:
+        tuple: (vertices, csr), vertices is the list of the dict keys, None for the other inputs.
+    """
+    if isinstance(graph, dict):
+        vertices, neighbors = index_graph(graph)
+        offsets, targets = flatten(neighbors)
+        return vertices, CSRAdjacency(np.asarray(offsets, dtype=np.int64), np.asarray(targets, dtype=np.int64))
+    if isinstance(graph, CSRAdjacency):
+        return None, graph
+    if graph.is_undirected:
+        return None, (graph.adjacency_list if graph.storage == "csr" else graph.build_csr())
+    src, dst, _ = graph.edge_arrays()
+    return None, CSRAdjacency.from_edges(graph.V, src, dst)
+
+
+def first_fit(offsets, targets, order):
+    """
+    Color the vertices in the given order, each with the smallest color none of its colored neighbours has.
+    The colors seen around a vertex are marked in a stamp array, no set is built: O(V+E).
+    Returns:
+        list: color of every vertex.
+    """
+    n = len(offsets) - 1
+    max_degree = int(np.diff(np.asarray(offsets, dtype=np.int64)).max(initial=0))
+    colors = [-1] * n
+    stamp = [-1] * (max_degree + 2)  # stamp[c] == v: a neighbour of v has color c
+    for v in order:
+        for u in targets[offsets[v]:offsets[v + 1]]:
+            c = colors[u]
+            if c >= 0:
+                stamp[c] = v
+        c = 0
+        while stamp[c] == v:
+            c += 1
+        colors[v] = c
+    return colors
+
+
+def row_entries(offsets, targets, vertices):
+    """
+    Concatenated CSR rows of the given vertices, gathered with one index array.
+    """
+    starts, counts = offsets[vertices], offsets[vertices + 1] - offsets[vertices]
+    shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return targets[shift + np.arange(len(shift))]
+
+
+def smallest_last_order(offsets, targets, max_rounds=1024):
+    """
+    Degeneracy (smallest-last) order. While the current minimum degree k is reached by many vertices, every
+    vertex of degree <= k is peeled at once with NumPy and the neighbour degrees are updated by counting;
+    any vertex removed at level k has at most k neighbours left, which is all the coloring bound needs.
+    After max_rounds rounds (long paths peel only two vertices per round), the rest is ordered
+    by the Batagelj–Zaversnik bucket algorithm: the vertices sorted by degree in one array, the bucket starts
+    in another, and every removal moves a neighbour one bucket down by a swap. O(V+E) either way.
+    Returns:
+        tuple: (order, core), order lists the vertices from first removed to last, core[v] is the core number of v.
+    """
+    offsets, targets = np.asarray(offsets, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+    n = len(offsets) - 1
+    degree = np.diff(offsets)
+    core = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    batches = []
+    k, remaining = 0, n
+    candidates = np.flatnonzero(degree <= k)
+    for _ in range(max_rounds):
+        if not remaining:
+            break
+        batch = candidates[alive[candidates] & (degree[candidates] <= k)]
+        if len(batch) == 0:
+            k = int(degree[alive].min())
+            candidates = np.flatnonzero(alive & (degree <= k))
+            continue
+        alive[batch] = False
+        core[batch] = k
+        batches.append(batch)
+        remaining -= len(batch)
+        touched = row_entries(offsets, targets, batch)
+        touched, counts = np.unique(touched[alive[touched]], return_counts=True)
+        degree[touched] -= counts
+        candidates = touched[degree[touched] <= k]
+    peeled = np.concatenate(batches) if batches else np.empty(0, dtype=np.int64)
+    if not remaining:
+        return peeled.tolist(), core.tolist()
+
+    rest = np.flatnonzero(alive)
+    rest = rest[np.argsort(degree[rest], kind="stable")]
+    start = np.zeros(int(degree[rest].max()) + 2, dtype=np.int64)
+    np.cumsum(np.bincount(degree[rest], minlength=len(start) - 1), out=start[1:])
+    start += len(peeled)
+    order = np.concatenate((peeled, rest))
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n)
+    degree[~alive] = -1  # peeled vertices are never moved
+    order, position, start = order.tolist(), position.tolist(), start.tolist()
+    degree, offsets, targets = degree.tolist(), offsets.tolist(), targets.tolist()
+
+    for i in range(len(peeled), n):  # the swaps only move vertices after i
+        v = order[i]
+        dv = degree[v]
+        for u in targets[offsets[v]:offsets[v + 1]]:
+            du = degree[u]
+            if du > dv:
+                # swap u with the first vertex of its bucket, then move the bucket start past it
+                first = start[du]
+                w = order[first]
+                if u != w:
+                    pu = position[u]
+                    order[pu] = w
+                    order[first] = u
+                    position[w] = pu
+                    position[u] = first
+                start[du] = first + 1
+                degree[u] = du - 1
+    core = core.tolist()
+    for v in rest.tolist():
+        core[v] = max(k, degree[v])
+    return order, core
+
+
+def welsh_powell_coloring(offsets, targets):
+    """
+    Welsh–Powell: first fit in decreasing degree order.
+    """
+    degree = np.diff(np.asarray(offsets, dtype=np.int64))
+    return first_fit(offsets, targets, np.argsort(-degree, kind="stable").tolist())
+
+
+def smallest_last_coloring(offsets, targets):
+    """
+    First fit in reverse degeneracy order: uses at most degeneracy + 1 colors.
+    """
+    order, _ = smallest_last_order(offsets, targets)
+    return first_fit(offsets, targets, order[::-1])
+
+
+def dsatur_greedy(offsets, targets):
+    """
+    Greedy DSATUR: repeatedly color the uncolored vertex with the most distinct neighbour colors
+    (saturation; ties: highest degree) with its smallest free color.
+    The neighbour colors of a vertex are an int bitmask, the next vertex comes from a heap with lazy
+    deletion (stale entries are skipped): O((V+E)logV).
+    Returns:
+        list: color of every vertex.
+    """
+    n = len(offsets) - 1
+    colors = [-1] * n
+    taken = [0] * n  # bit c set: a neighbour has color c
+    saturation = [0] * n
+    heap = [(0, offsets[v] - offsets[v + 1], v) for v in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        negative_saturation, negative_degree, v = heapq.heappop(heap)
+        if colors[v] >= 0 or -negative_saturation != saturation[v]:
+            continue
+        mask = taken[v]
+        c = (~mask & (mask + 1)).bit_length() - 1  # lowest zero bit
+        colors[v] = c
+        bit = 1 << c
+        for u in targets[offsets[v]:offsets[v + 1]]:
+            if colors[u] < 0 and not taken[u] & bit:
+                taken[u] |= bit
+                saturation[u] += 1
+                heapq.heappush(heap, (-saturation[u], offsets[u] - offsets[u + 1], u))
+    return colors
+
+
+def greedy_clique_size(offsets, targets, tries=16):
+    """
+    Size of a clique grown greedily (always adding the candidate of highest degree) from each of the
+    `tries` vertices of highest degree: a lower bound on the chromatic number.
+    """
+    degree = np.diff(np.asarray(offsets, dtype=np.int64))
+    best = 1 if len(degree) else 0
+    for v in np.argsort(-degree, kind="stable")[:tries].tolist():
+        size = 1
+        candidates = set(targets[offsets[v]:offsets[v + 1]])
+        candidates.discard(v)
+        while candidates:
+            u = max(candidates, key=lambda w: offsets[w + 1] - offsets[w])
+            size += 1
+            candidates &= set(targets[offsets[u]:offsets[u + 1]])
+            candidates.discard(u)
+        best = max(best, size)
+    return best
+
+
+def is_bipartite(offsets, targets):
+    """
+    2-color every component by BFS: False as soon as an edge joins two vertices of the same side.
+    """
+    n = len(offsets) - 1
+    side = [-1] * n
+    for start in range(n):
+        if side[start] >= 0:
+            continue
+        side[start] = 0
+        queue = [start]
+        for v in queue:
+            for u in targets[offsets[v]:offsets[v + 1]]:
+                if side[u] < 0:
+                    side[u] = 1 - side[v]
+                    queue.append(u)
+                elif side[u] == side[v]:
+                    return False
+    return True
+
+
+HEURISTICS = {
+    "welsh_powell": welsh_powell_coloring,
+    "smallest_last": smallest_last_coloring,
+    "dsatur": dsatur_greedy,
 }
-maximal_clique = find_maximal_clique(petersen_graph)
-k = len(maximal_clique)
-m = k
-while True:
-    is_colorable, coloring = is_m_colorable(petersen_graph, m)
-    if is_colorable:
-        break
-    m += 1
-print(f"Chromatic number: {m}")
-
-# Create a NetworkX graph from the dictionary
-G = nx.from_dict_of_lists(petersen_graph)
-some_color_list = ['red', 'blue', 'green', 'yellow', 'purple']
-color_map = [some_color_list[coloring[node]] for node in G.nodes()]
-pos = nx.shell_layout(G)
-nx.draw(G, pos, node_color=color_map, with_labels=True)
-plt.title("Wheel Graph W_5 with Optimal Coloring")
-plt.show()
\ No newline at end of file
+
+
+def heuristic_coloring(graph, method="smallest_last"):
+    """
+    Color a large graph fast, without an exact search, and bound its chromatic number.
+    Methods: "welsh_powell" and "smallest_last" are O(V+E), "dsatur" O((V+E)logV) and usually uses the
+    fewest colors, "best" runs the three and keeps the best coloring.
+    The lower bound is the largest of: a greedily grown clique, 2 if there is an edge, 3 if the graph is not
+    bipartite (only checked when the coloring needs 3 colors or more). The upper bound is the number of
+    colors of the coloring.
+    Args:
+        graph: adjacency dict, Graph object (from graph_base.py) or CSRAdjacency (from graph_storage.py).
+        method (str): "smallest_last" (default), "welsh_powell", "dsatur" or "best".
+    Returns:
+        tuple: (coloring, lower, upper). The coloring is a dict vertex -> color for an adjacency dict,
+               else an array of the colors of the vertices 0..V-1.
+    """
+    if method != "best" and method not in HEURISTICS:
+        raise ValueError(f"Unknown coloring method: {method!r}")
+    vertices, csr = adjacency_arrays(graph)
+    has_edge = bool(np.any(np.repeat(np.arange(len(csr)), csr.degrees()) != csr.targets))  # not a self loop
+    offsets, targets = csr.offsets.tolist(), csr.targets.tolist()
+    methods = list(HEURISTICS) if method == "best" else [method]
+    colors = min((HEURISTICS[name](offsets, targets) for name in methods), key=lambda colors: max(colors, default=-1))
+    upper = max(colors, default=-1) + 1
+
+    lower = min(greedy_clique_size(offsets, targets), upper)
+    if has_edge:
+        lower = max(lower, 2)
+    if lower < 3 <= upper and not is_bipartite(offsets, targets):
+        lower = 3
+
+    if vertices is not None:
+        return {v: colors[i] for i, v in enumerate(vertices)}, lower, upper
+    return np.asarray(colors, dtype=np.int64), lower, upper
+
+
+if __name__ == "__main__":
+    graph = {
+            0: [1, 2, 3, 4],  # Central vertex
+            1: [0, 2, 4],     # Cycle: 1-2-3-4-1
+            2: [0, 1, 3],
+            3: [0, 2, 4],
+            4: [0, 1, 3]
+        }
+    petersen_graph = {
+            0: [1, 4, 5],
+            1: [0, 2, 6],
+            2: [1, 3, 7],
+            3: [2, 4, 8],
+            4: [0, 3, 9],
+            5: [0, 7, 8],
+            6: [1, 8, 9],
+            7: [2, 5, 9],
+            8: [3, 5, 6],
+            9: [4, 6, 7]
+    }
+    m, coloring = chromatic_number(petersen_graph)
+    print(f"Chromatic number: {m}")
+
+    # Create a NetworkX graph from the dictionary
+    G = nx.from_dict_of_lists(petersen_graph)
+    some_color_list = ['red', 'blue', 'green', 'yellow', 'purple']
+    color_map = [some_color_list[coloring[node]] for node in G.nodes()]
+    pos = nx.shell_layout(G)
+    nx.draw(G, pos, node_color=color_map, with_labels=True)
+    plt.title("Wheel Graph W_5 with Optimal Coloring")
+    plt.show()
@@ -1,3 +1,7 @@
+import numpy as np
+from graph_labels import VertexLabels
+
+
 def generate_power_set(iterable):
     """
     Generate all non-empty subsets of the input iterable.
@@ -29,28 +33,39 @@ def is_connected(vertices, edges):
     """
     Check if the graph defined by the list of vertices and the given list of edges is connected.
     Uses Depth-First Search (DFS).
+    The vertex labels are interned to integer ids once, so the DFS itself works on lists indexed by id.
     """
     if not vertices:
         return True
 
-    graph = build_graph(vertices, edges)
-    start = vertices[0]
-    visited = set()
-    stack = [start]
+    labels = VertexLabels(vertices)
+    graph = [[] for _ in range(len(labels))]
+    for u, v in edges:
+        u, v = labels.id_of(u), labels.id_of(v)
+        graph[u].append(v)
+        graph[v].append(u)
+
+    visited = bytearray(len(labels))
+    visited[0] = 1
+    n_visited = 1
+    stack = [0]
 
     while stack:
         node = stack.pop()
-        if node not in visited:
-            visited.add(node)
+        for neighbor in graph[node]:
             # Add unvisited neighbors to the stack
-            stack.extend(graph[node] - visited)
-            
-    return len(visited) == len(vertices)
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                n_visited += 1
+                stack.append(neighbor)
+
+    return n_visited == len(labels)
 
 def find_cut_sets(vertices, edges):
     """
     Find all cut-sets of the graph by generating the power set of edges.
     A cut-set is a set of edges whose removal disconnects the graph.
+    This takes O(2^E) time and memory: iter_bonds generates the minimal cut-sets lazily.
     """
     all_cut_sets = []
     # Generate all non-empty subsets of the edge list
@@ -63,25 +78,190 @@ def find_cut_sets(vertices, edges):
             all_cut_sets.append(set(subset))
     
     return all_cut_sets
+def edge_endpoints(labels, edges):
+    """
+    The integer ids of the end points of every edge, as two int64 arrays (src, dst).
+    labels: VertexLabels of the vertices, an edge with an unknown vertex raises ValueError
+    """
+    ids = dict(zip(labels, range(len(labels))))
+    try:
+        src = np.array([ids[u] for u, _ in edges], dtype=np.int64).reshape(len(edges))
+        dst = np.array([ids[v] for _, v in edges], dtype=np.int64).reshape(len(edges))
+    except KeyError as error:
+        raise ValueError(f"Unknown vertex label: {error.args[0]!r}") from None
+    return src, dst
+
+
+def find_biconnected_components(vertices, edges):
+    """
+    Articulation points, bridges and biconnected components in one depth-first search (Tarjan's low-link
+    values): O(V+E). The search keeps its own stack, so long paths do not hit the recursion limit.
+    A vertex is an articulation point if its removal disconnects its connected component, an edge is a bridge
+    if its removal does, and the biconnected components (blocks) split the edges into maximal pieces without
+    an articulation point; a bridge is a block of its own. Parallel edges are never bridges.
+    The adjacency lists hold edge ids, so the search skips the tree edge it came in by and not the parent.
+    returns: (articulation_points, bridges, components) - the articulation points in the order of vertices,
+             the bridges and the blocks (lists of edges) as they appear in edges
+    """
+    labels = VertexLabels(vertices)
+    n, m = len(labels), len(edges)
+    src, dst = edge_endpoints(labels, edges)
+
+    # CSR adjacency: offsets, then the neighbour and the edge id of every entry
+    order = np.argsort(np.concatenate((src, dst)), kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(np.concatenate((src, dst)), minlength=n), out=offsets[1:])
+    neighbors = np.concatenate((dst, src))[order].tolist()
+    edge_ids = np.concatenate((np.arange(m), np.arange(m)))[order].tolist()
+    offsets = offsets.tolist()
+
+    discovered = [-1] * n  # DFS discovery time
+    low = [0] * n  # smallest discovery time reachable from the subtree by one back edge
+    parent_edge = [-1] * n
+    position = offsets[:-1]  # next adjacency entry to scan, per vertex
+    is_articulation = bytearray(n)
+    bridges, components = [], []
+    edge_stack = []  # edges of the blocks not closed yet
+    clock = 0
+
+    for root in range(n):
+        if discovered[root] >= 0:
+            continue
+        discovered[root] = low[root] = clock
+        clock += 1
+        root_children = 0
+        stack = [root]
+        while stack:
+            v = stack[-1]
+            i = position[v]
+            if i < offsets[v + 1]:
+                position[v] = i + 1
+                e = edge_ids[i]
+                if e == parent_edge[v]:
+                    continue
+                u = neighbors[i]
+                if discovered[u] < 0:  # tree edge
+                    discovered[u] = low[u] = clock
+                    clock += 1
+                    parent_edge[u] = e
+                    edge_stack.append(e)
+                    stack.append(u)
+                    root_children += v == root
+                elif discovered[u] < discovered[v]:  # back edge to an ancestor (self loops are skipped)
+                    if discovered[u] < low[v]:
+                        low[v] = discovered[u]
+                    edge_stack.append(e)
+                continue
+
+            # v is finished: report to its parent
+            stack.pop()
+            if not stack:
+                break
+            p = stack[-1]
+            if low[v] < low[p]:
+                low[p] = low[v]
+            if low[v] >= discovered[p]:
+                # nothing below v reaches above p: p separates v's subtree, the block ends at the edge p-v
+                if p != root:
+                    is_articulation[p] = 1
+                if low[v] > discovered[p]:
+                    bridges.append(edges[parent_edge[v]])
+                component = []
+                while True:
+                    e = edge_stack.pop()
+                    component.append(edges[e])
+                    if e == parent_edge[v]:
+                        break
+                components.append(component)
+        if root_children > 1:
+            is_articulation[root] = 1
+
+    articulation_points = [labels.label_of(v) for v in range(n) if is_articulation[v]]
+    return articulation_points, bridges, components
+
+
+def iter_bonds(vertices, edges, max_size=None):
+    """
+    Generate the minimal cut-sets (bonds) of the graph lazily, without the power set of the edges.
+    A bond is the set of edges between S and the rest of a connected component, where both S and the rest
+    are connected. S always holds the first vertex of the component and grows by search: branch on a vertex
+    next to S, it either joins S or is excluded (stays on the other side). A branch is only entered if it
+    still holds a bond: the excluded vertices must lie in one connected piece of the component minus S.
+    So without max_size every branch ends in a bond, and the time is polynomial per bond instead of 2^E overall.
+    The vertex sets are bitmasks (Python ints) and the search keeps its own stack.
+    max_size: (default=None) only bonds with at most this many edges; the edges between S and the excluded
+              vertices are in every bond below a branch, so larger branches are cut early
+    yields: sets of edges, as they appear in edges (the bonds of every connected component)
+    """
+    labels = VertexLabels(vertices)
+    n = len(labels)
+    src, dst = edge_endpoints(labels, edges)
+    src, dst = src.tolist(), dst.tolist()
+    neighbors = [0] * n  # bitmask of the neighbours of every vertex
+    for u, v in zip(src, dst):
+        neighbors[u] |= 1 << v
+        neighbors[v] |= 1 << u
+    # number of distinct edges between every pair of vertices, as they are counted in the yielded sets:
+    # parallel edges such as (u, v) and (v, u) all cross the cut
+    multiplicity = [dict() for _ in range(n)]
+    for edge, u, v in set(zip(edges, src, dst)):
+        if u != v:
+            multiplicity[u][v] = multiplicity[u].get(v, 0) + 1
+            multiplicity[v][u] = multiplicity[v].get(u, 0) + 1
+
+    def edges_to(v, T):
+        # number of edges between vertex v and the vertices of the bitmask T, only needed for max_size
+        if max_size is None:
+            return 0
+        return sum(count for w, count in multiplicity[v].items() if T >> w & 1)
+
+    def reach(start, allowed):
+        # bitmask of the vertices reachable from the start bits inside allowed
+        reached = frontier = start
+        while frontier:
+            grown = 0
+            while frontier:
+                bit = frontier & -frontier
+                grown |= neighbors[bit.bit_length() - 1]
+                frontier ^= bit
+            frontier = grown & allowed & ~reached
+            reached |= frontier
+        return reached
+
+    def holds_bond(S, X, component):
+        rest = component & ~S
+        return rest and (not X or X & ~reach(X & -X, rest) == 0)
+
+    unseen = (1 << n) - 1
+    while unseen:
+        component = reach(unseen & -unseen, unseen)
+        unseen &= ~component
+        root = component & -component
+        # (S, X, neighbours of S, number of edges between S and X)
+        stack = [(root, 0, neighbors[root.bit_length() - 1], 0)] if component != root else []
+        while stack:
+            S, X, boundary, crossing = stack.pop()
+            free = boundary & ~S & ~X
+            if not free:  # nothing left to add: S and the rest of the component are both connected
+                yield {edge for edge, u, v in zip(edges, src, dst) if (S >> u & 1) != (S >> v & 1)}
+                continue
+            v = free & -free
+            vertex = v.bit_length() - 1
+            adjacent = neighbors[vertex]
+            children = ((S, X | v, boundary, crossing + edges_to(vertex, S)),
+                        (S | v, X, boundary | adjacent, crossing + edges_to(vertex, X)))
+            for child in children:  # the include branch is popped first
+                if (max_size is None or child[3] <= max_size) and holds_bond(child[0], child[1], component):
+                    stack.append(child)
+
+
 def find_articulation_points(vertices, edges):
     """
     Find all articulation points in the graph.
-    A vertex is an articulation point if its removal disconnects the graph.
+    A vertex is an articulation point if its removal disconnects the graph (its connected component).
+    See find_biconnected_components: one O(V+E) search instead of one connectivity test per vertex.
     """
-    articulation_points = []
-    
-    # Assume the original graph is connected.
-    for v in vertices:
-        # Remove vertex v from the list of vertices.
-        remaining_vertices = [u for u in vertices if u != v]
-        # Remove edges incident to vertex v.
-        remaining_edges = [ (u, w) for (u, w) in edges if u != v and w != v ]
-        
-        # Check connectivity of the remaining graph.
-        if remaining_vertices and not is_connected(remaining_vertices, remaining_edges):
-            articulation_points.append(v)
-            
-    return articulation_points
+    return find_biconnected_components(vertices, edges)[0]
 
 if __name__ == "__main__":
    
@@ -96,9 +276,16 @@ if __name__ == "__main__":
         ('A', 'E') 
     ]
     
+    bonds = list(iter_bonds(vertices, edges))
+    print("Minimal cut-sets (bonds):")
+    for i, bond in enumerate(bonds, 1):
+        print(f"Bond {i}: {bond}")
     cut_sets = find_cut_sets(vertices, edges)
     print("Cut-sets of the graph:")
     for i, cs in enumerate(cut_sets, 1):
         print(f"Cut-set {i}: {cs}")
     articulation_pts = find_articulation_points(vertices, edges)
     print("Articulation Points:", articulation_pts)
+    _, bridges, blocks = find_biconnected_components(vertices, edges)
+    print("Bridges:", bridges)
+    print("Biconnected components:", blocks)
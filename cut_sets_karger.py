@@ -1,49 +1,328 @@
-import random
-import copy
+import heapq
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+from graph_unionfind import UnionFind
 
-def karger_min_cut(graph, iterations=100):
+
+def edge_array(graph):
+    """
+    Edge arrays of an adjacency list dict, every undirected edge once (parallel edges are kept, self-loops dropped).
+
+    Parameters:
+        graph (dict): An undirected graph represented as a dictionary where each key is a vertex
+                      and its value is a list of adjacent vertices.
+
+    Returns:
+        tuple: (vertices, src, dst) - the vertex labels, and the endpoints of every edge as indices into vertices.
+    """
+    vertices = list(graph)
+    index = {v: i for i, v in enumerate(vertices)}
+    src, dst = [], []
+    for u in vertices:
+        i = index[u]
+        for v in graph[u]:
+            if v not in index:
+                index[v] = len(vertices)
+                vertices.append(v)
+            j = index[v]
+            if i < j:  # the edge is listed from both ends: keep it once
+                src.append(i)
+                dst.append(j)
+    return vertices, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+
+
+def contract(n, src, dst, weights, rng, target=2):
+    """
+    Contract random edges until target vertices are left (fewer edges may leave more: the graph is disconnected).
+    Contracting a uniformly random edge of the multigraph, again and again, is the same as giving every edge
+    an exponential arrival time of rate weight (heavier edges come first) and merging the endpoints of the
+    edges in arrival order, skipping those already inside one vertex: Kruskal's algorithm on random keys,
+    with a union-find instead of rewriting the adjacency lists. O(E log E).
+
+    Returns:
+        np.ndarray: the contracted vertex (0..k-1) of every vertex.
+    """
+    sets = UnionFind(n)
+    order = np.argsort(rng.exponential(size=len(src)) / weights)
+    src, dst = src[order].tolist(), dst[order].tolist()
+    for u, v in zip(src, dst):
+        if sets.n_sets <= target:
+            break
+        sets.union(u, v)
+    return np.unique(sets.roots(), return_inverse=True)[1].reshape(-1)
+
+
+def contracted_edges(labels, k, src, dst, weights):
+    """
+    Edges of the contracted graph: endpoints relabeled, self-loops dropped and parallel edges merged into one
+    edge with the summed weight.
+    """
+    a, b = labels[src], labels[dst]
+    keep = a != b
+    a, b, weights = np.minimum(a, b)[keep], np.maximum(a, b)[keep], weights[keep]
+    keys, inverse = np.unique(a * k + b, return_inverse=True)
+    return keys // k, keys % k, np.bincount(inverse.reshape(-1), weights=weights, minlength=len(keys))
+
+
+def cut_value(side, src, dst, weights):
+    return weights[side[src] != side[dst]].sum()
+
+
+@lru_cache(maxsize=None)
+def bipartitions(n):
+    """
+    All 2^(n-1) - 1 bipartitions of n vertices as rows of a boolean array (the last vertex is always False).
+    """
+    return (np.arange(1, 2 ** (n - 1))[:, None] >> np.arange(n)) & 1 == 1
+
+
+def brute_force_cut(n, src, dst, weights):
+    """
+    Minimum cut of a small graph over all its bipartitions.
+
+    Returns:
+        tuple: (cut value, side) - side is a boolean array, True for the vertices on one side of the cut.
+    """
+    sides = bipartitions(n)
+    values = ((sides[:, src] != sides[:, dst]) * weights).sum(axis=1)
+    best = int(np.argmin(values))
+    return values[best], sides[best]
+
+
+def karger_trial(n, src, dst, weights, rng):
+    """
+    One run of Karger's algorithm: contract down to two vertices, the edges between them are the cut.
+    It is a minimum cut with probability at least 2/(n(n-1)).
+
+    Returns:
+        tuple: (cut value, side)
+    """
+    side = contract(n, src, dst, weights, rng) == 0
+    return cut_value(side, src, dst, weights), side
+
+
+def karger_stein(n, src, dst, weights, rng):
+    """
+    One run of the recursive Karger–Stein algorithm: contract to 1 + n/sqrt(2) vertices twice, independently,
+    solve both contracted graphs recursively and keep the smaller cut; graphs of at most 12 vertices are solved
+    by brute force (below that a level only removes one or two vertices, but doubles the number of calls).
+    The early contractions rarely hit the minimum cut, so one run finds it with probability Omega(1/log n),
+    in O(n^2 log n) time.
+
+    Returns:
+        tuple: (cut value, side)
+    """
+    if len(src) == 0:  # disconnected: one contracted vertex against the rest
+        return weights.sum(), np.arange(n) == 0
+    if n <= 12:
+        return brute_force_cut(n, src, dst, weights)
+    target = math.ceil(1 + n / math.sqrt(2))
+    best = None
+    for _ in range(2):
+        labels = contract(n, src, dst, weights, rng, target)
+        k = int(labels.max()) + 1
+        value, side = karger_stein(k, *contracted_edges(labels, k, src, dst, weights), rng)
+        if best is None or value < best[0]:
+            best = (value, side[labels])
+    return best
+
+
+METHODS = {
+    "karger": karger_trial,
+    "karger_stein": karger_stein,
+}
+
+
+def run_trials(n, src, dst, weights, method, trials, seed):
+    """
+    Run trials of a method with a generator seeded by seed (a SeedSequence), keep the smallest cut.
+    """
+    rng = np.random.default_rng(seed)
+    best = None
+    for _ in range(trials):
+        value, side = METHODS[method](n, src, dst, weights, rng)
+        if best is None or value < best[0]:
+            best = (value, side)
+    return best
+
+
+def random_min_cut(n, src, dst, weights=None, iterations=100, method="karger", workers=1, seed=None):
+    """
+    Smallest cut found by repeated randomized contraction of a (weighted) edge array.
+
+    Parameters:
+        n (int): Number of vertices, the edges join vertices 0..n-1.
+        src, dst (np.ndarray): Endpoints of the edges.
+        weights (np.ndarray): Edge weights, 1 for every edge if None.
+        iterations (int): Number of independent trials.
+        method (str): "karger" (one contraction to two vertices per trial, O(E log E)) or "karger_stein"
+                      (recursive, far more likely to succeed per trial on small dense graphs).
+        workers (int): Number of processes the trials are split over.
+        seed: Seed of the trials (int or SeedSequence): every worker gets its own child seed, so the result
+              does not depend on the scheduling.
+
+    Returns:
+        tuple: (min_cut_value, side) - side is a boolean array, True for the vertices on one side of the cut.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown min-cut method: {method!r}")
+    if n < 2:
+        raise ValueError("A graph needs at least two vertices to have a cut")
+    weights = np.ones(len(src)) if weights is None else np.asarray(weights, dtype=np.float64)
+    if method == "karger_stein":
+        src, dst, weights = contracted_edges(np.arange(n), n, src, dst, weights)  # merge the parallel edges
+
+    workers = max(1, min(workers, iterations))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    trials = [iterations // workers + (i < iterations % workers) for i in range(workers)]
+    if workers == 1:
+        results = [run_trials(n, src, dst, weights, method, trials[0], seeds[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_trials, *zip(*[(n, src, dst, weights, method, t, s)
+                                                        for t, s in zip(trials, seeds)])))
+    return min(results, key=lambda result: result[0])
+
+
+def karger_min_cut(graph, iterations=100, method="karger", workers=1, seed=None):
     """
     Runs Karger's randomized min-cut algorithm on the input graph for a given number of iterations.
-    
+    The contractions run on an edge array with a union-find (see random_min_cut), trials can be split over
+    a process pool.
+
     Parameters:
-        graph (dict): An undirected graph represented as a dictionary where each key is a vertex 
+        graph (dict): An undirected graph represented as a dictionary where each key is a vertex
                       and its value is a list of adjacent vertices.
         iterations (int): The number of times the algorithm is run.
-    
+        method (str): "karger" or "karger_stein" (recursive contractions).
+        workers (int): Number of processes the iterations are split over.
+        seed (int): Seed of the random contractions, None for a fresh one.
+
     Returns:
-        tuple: (min_cut_value, best_contracted_graph) where best_contracted_graph is the 
+        tuple: (min_cut_value, best_contracted_graph) where best_contracted_graph is the
                contracted graph (with two vertices) that produced the min cut.
     """
-    min_cut = float('inf')
-    best_cut_graph = None
-
-    for i in range(iterations):
-        local_graph = copy.deepcopy(graph)
-        
-        while len(local_graph) > 2:
-            u = random.choice(list(local_graph.keys()))
-            v = random.choice(local_graph[u])
-            
-            # Merge v into u by extending u's list with v's adjacent vertices.
-            local_graph[u].extend(local_graph[v])
-            
-            del local_graph[v]
-            
-            # Replace all occurrences of v with u in the graph.
-            for vertex in local_graph:
-                local_graph[vertex] = [u if x == v else x for x in local_graph[vertex]]
-            
-            # Remove self-loops from u's list.
-            local_graph[u] = [x for x in local_graph[u] if x != u]
-        
-        # At this point, the graph has two vertices. The cut value is the number of edges 
-        # between these two remaining vertices.
-        cut_value = len(list(local_graph.values())[0])
-        if cut_value < min_cut:
-            min_cut = cut_value
-            best_cut_graph = local_graph
-
-    return min_cut, best_cut_graph
+    vertices, src, dst = edge_array(graph)
+    value, side = random_min_cut(len(vertices), src, dst, iterations=iterations, method=method, workers=workers,
+                                 seed=seed)
+    value = int(value)
+    # each side is named after its first vertex
+    u, v = vertices[int(np.argmax(side))], vertices[int(np.argmin(side))]
+    return value, {u: [v] * value, v: [u] * value}
+
+
+def stoer_wagner(n, src, dst, weights):
+    """
+    Deterministic global minimum cut (Stoer–Wagner) of a connected graph with non-negative weights.
+    Every phase adds the vertices one by one in maximum adjacency order (next: the vertex most strongly
+    connected to those already added, from a heap with lazy deletion), the last vertex t against the rest is
+    a cut, and t is merged into the vertex added before it. The smallest of the V-1 phase cuts is a minimum
+    cut. O(VE log V).
+
+    Returns:
+        tuple: (cut value, side) - side is a boolean array, True for the vertices on one side of the cut.
+    """
+    sets = UnionFind(n)
+    for u, v in zip(src.tolist(), dst.tolist()):
+        sets.union(u, v)
+    if sets.n_sets > 1:  # disconnected: a component against the rest
+        roots = sets.roots()
+        return 0, roots == roots[0]
+
+    adjacent = [dict() for _ in range(n)]  # merged weights, no self loops
+    for u, v, w in zip(*(array.tolist() for array in contracted_edges(np.arange(n), n, src, dst, weights))):
+        adjacent[u][v] = adjacent[v][u] = w
+    members = [[v] for v in range(n)]  # original vertices inside every merged vertex
+    active = set(range(n))
+    best, best_members = math.inf, None
+    push, pop = heapq.heappush, heapq.heappop
+    while len(active) > 1:
+        start = next(iter(active))
+        key = [0] * n
+        added = [False] * n
+        heap = [(0, start)]
+        s = t = start
+        while heap:
+            _, v = pop(heap)
+            if added[v]:
+                continue  # stale entry, v was pushed again with a larger key
+            added[v] = True
+            s, t = t, v
+            for u, w in adjacent[v].items():
+                if not added[u]:
+                    key[u] += w
+                    push(heap, (-key[u], u))
+        if key[t] < best:
+            best, best_members = key[t], list(members[t])
+
+        # merge t into s
+        for u, w in adjacent[t].items():
+            del adjacent[u][t]
+            if u != s:
+                adjacent[s][u] = adjacent[u][s] = adjacent[s].get(u, 0) + w
+        adjacent[t] = None
+        members[s].extend(members[t])
+        active.remove(t)
+
+    side = np.zeros(n, dtype=bool)
+    side[best_members] = True
+    return best, side
+
+
+def cut_input(graph):
+    """
+    Vertices and weighted edge arrays of an adjacency list dict or a Graph object (from graph_base.py; the
+    weights are used if is_weighted, the edges of directed graphs are taken as undirected).
+
+    Returns:
+        tuple: (vertices, src, dst, weights) - vertex labels, edge endpoints as indices into vertices, and
+               the weights, None for unweighted graphs.
+    """
+    if isinstance(graph, dict):
+        return edge_array(graph) + (None,)
+    src, dst, weights = graph.edge_arrays()
+    vertices = [graph.vertex_label(v) for v in range(graph.V)]
+    if not graph.is_weighted:
+        weights = None
+    return vertices, src, dst, (None if weights is None else np.asarray(weights, dtype=np.float64))
+
+
+MIN_CUT_METHODS = ("stoer_wagner",) + tuple(METHODS)
+
+
+def min_cut(graph, method="stoer_wagner", iterations=100, workers=1, seed=None):
+    """
+    Global minimum cut of an undirected graph, exact or randomized.
+
+    Parameters:
+        graph: Adjacency list dict or Graph object (from graph_base.py, weighted graphs use their weights,
+               which must be non-negative).
+        method (str): "stoer_wagner" (deterministic, exact) or "karger" / "karger_stein" (randomized, see
+                      random_min_cut: faster on large graphs, but only correct with high probability).
+        iterations, workers, seed: Trials of the randomized methods (see random_min_cut).
+
+    Returns:
+        tuple: (min_cut_value, (side, other_side)) - the cut value (an int for unweighted graphs) and the
+               vertices on either side of the cut.
+    """
+    if method not in MIN_CUT_METHODS:
+        raise ValueError(f"Unknown min-cut method: {method!r}")
+    vertices, src, dst, weights = cut_input(graph)
+    if len(vertices) < 2:
+        raise ValueError("A graph needs at least two vertices to have a cut")
+    if weights is not None and len(weights) and weights.min() < 0:
+        raise ValueError("Minimum cut needs non-negative edge weights")
+
+    if method == "stoer_wagner":
+        value, side = stoer_wagner(len(vertices), src, dst, np.ones(len(src)) if weights is None else weights)
+    else:
+        value, side = random_min_cut(len(vertices), src, dst, weights, iterations, method, workers, seed)
+    value = int(value) if weights is None else float(value)
+    return value, ([v for v, inside in zip(vertices, side) if inside],
+                   [v for v, inside in zip(vertices, side) if not inside])
+
 
 if __name__ == "__main__":
     graph = {
@@ -52,7 +331,8 @@ if __name__ == "__main__":
         '3': ['1', '2', '4'],
         '4': ['1', '2', '3']
     }
-    
-    iterations = 200  
-    min_cut, contracted_graph = karger_min_cut(graph, iterations)
-    print("Minimum cut:", min_cut)
+
+    iterations = 200
+    value, contracted_graph = karger_min_cut(graph, iterations)
+    print("Minimum cut:", value)
+    print("Minimum cut (Stoer-Wagner):", min_cut(graph))
@@ -1,33 +1,105 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 import numpy as np
 import networkx as nx
 from networkx.linalg import graphmatrix
 from matplotlib import pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from graph_storage import CSRAdjacency, SparseIncidence
+import graph_io
+from graph_labels import VertexLabels
 
 
 class GraphView():
-    def __init__(self, V, E, edges, is_undirected=True, is_weighted=False, is_labelled=False):
+    # views built on first access, see get_view
+    VIEWS = ("adjacency_list", "adjacency_matrix", "incidence_matrix")
+
+    def __init__(self, V, E, edges, is_undirected=True, is_weighted=False, is_labelled=False, storage="list"):
         """
         Initialize the graph view.
+        No view is built here: each one is materialized on first access and then kept up to date.
         V: number of vertices
         E: number of edges
         edges: list of edges
         is_undirected: (default=True) True if the graph is undirected, False otherwise
         is_weighted: (default=False) True if the graph is weighted, False otherwise
         is_labelled: (default=False) True if the graph is labelled, False otherwise
+        storage: (default="list") "list" keeps the adjacency list as lists of (neighbour, weight) tuples,
+                 "csr" keeps it as a compressed sparse row structure, O(V+E) memory
+                 Streaming single-edge updates need "list": it patches the views in O(1) per update
+                 (about 10^5 updates/s on a 10^6-edge graph, see benchmarks/bench_mutation.py), while "csr"
+                 deletes in O(E) and rebuilds the CSR in O(ElogE) on the next read; group csr updates in batch()
         """
         self.V = V  # number of vertices
         self.E = E  # number of edges
-        self.edges_list = edges  # list of edges
-        self.last_el_ptr = 0  # pointer to the last element in the edge list
+        self._edges_list = edges  # list of edges, None while the edges are only held as arrays
+        self._edge_arrays = None  # (src, dst, weights) when the graph was loaded from arrays, see from_arrays
+        self.last_el_ptr = len(edges)  # pointer to the last element in the edge list reflected in the views
         self.is_undirected = is_undirected  # True if the graph is undirected
         self.is_weighted = is_weighted  # True if the graph is weighted
         self.is_labelled = is_labelled
-        self.adjacency_list = [[] for _ in range(self.V)]
-        self.adjacency_matrix = [
-            [0 for _ in range(self.V)] for __ in range(self.V)]
-        self.incidence_matrix = [[] for __ in range(self.V)]
-        self.update_all_views(1)
-        self.last_el_ptr += self.E
+        if storage not in ("list", "csr"):
+            raise ValueError(f"Unknown storage backend: {storage}")
+        self.storage = storage
+        self.version = 0  # incremented on every mutation
+        self.views = dict()  # materialized views: name -> view
+        self.view_versions = dict()  # name -> graph version the view reflects, stale if behind self.version
+        self._edge_slots = None  # hash index: edge -> slots of the edges list holding it, built on demand
+        self.labels = None  # VertexLabels table when the vertices have non-integer labels, see from_labelled_edges
+
+    @property
+    def edges_list(self):
+        """
+        The list of edge tuples. A graph loaded from arrays builds it only on first access
+        (e.g. to mutate the graph) and then drops the arrays.
+        """
+        if self._edges_list is None:
+            src, dst, weights = self._edge_arrays
+            if weights is None:
+                self._edges_list = list(zip(src.tolist(), dst.tolist()))
+            else:
+                self._edges_list = list(zip(src.tolist(), dst.tolist(), weights.tolist()))
+            self._edge_arrays = None
+        return self._edges_list
+
+    @property
+    def adjacency_list(self):
+        return self.get_view("adjacency_list")
+
+    @property
+    def adjacency_matrix(self):
+        return self.get_view("adjacency_matrix")
+
+    @property
+    def incidence_matrix(self):
+        return self.get_view("incidence_matrix")
+
+    @property
+    def edge_slots(self):
+        """
+        Hash index from edge to the slots of the edges list holding it, built on first use: O(E).
+        """
+        if self._edge_slots is None:
+            self._edge_slots = defaultdict(list)
+            for i, edge in enumerate(self.edges_list):
+                self._edge_slots[edge].append(i)
+        return self._edge_slots
+
+    def get_view(self, name):
+        """
+        Return the view, building it if it was never materialized or is stale.
+        """
+        if name not in self.views or self.view_versions[name] != self.version:
+            self.views[name] = getattr(self, "build_" + name)()
+            self.view_versions[name] = self.version
+        return self.views[name]
+
+    def is_materialized(self, name):
+        """
+        True if the view is built and up to date.
+        """
+        return name in self.views and self.view_versions[name] == self.version
 
     def print_adjacency_list(self):
         print("Adjacency List:")
@@ -40,92 +112,361 @@ class GraphView():
 
     def print_incidence_matrix(self):
         print("Incidence Matrix:")
-        print(np.array(self.incidence_matrix))
-    # provide lists of edges to delete, check same for matrix as well
+        print(self.incidence_matrix.toarray())
+
+    def neighbors(self, v):
+        """
+        Neighbours of vertex v, without the weights.
+        """
+        if self.storage == "csr":
+            return self.adjacency_list.neighbors(v)
+        return [neighbor for neighbor, _ in self.adjacency_list[v]]
+
+    def degree(self, v):
+        """
+        Degree of vertex v (out-degree for directed graphs).
+        """
+        if self.storage == "csr":
+            return self.adjacency_list.degree(v)
+        return len(self.adjacency_list[v])
+
+    def vertex_id(self, label):
+        """
+        Integer id of a vertex label (the label itself if the graph has no label table).
+        """
+        return label if self.labels is None else self.labels.id_of(label)
 
-    def update_adjacency_list(self, operation, del_edges=[]):
+    def vertex_label(self, v):
         """
-        Update the adjacency list after adding an edge.
-        operation: 1 for adding an edge, 0 for deleting an edge
+        Label of the vertex with integer id v (v itself if the graph has no label table).
         """
+        return v if self.labels is None else self.labels.label_of(v)
+
+    def build_adjacency_list(self):
+        if self.storage == "csr":
+            return self.build_csr()
+        self.views["adjacency_list"] = [[] for _ in range(self.V)]
+        self.update_adjacency_list(1, start=0)
+        return self.views["adjacency_list"]
+
+    def build_adjacency_matrix(self):
+        self.views["adjacency_matrix"] = [
+            [0 for _ in range(self.V)] for __ in range(self.V)]
+        self._matrix_pairs = defaultdict(Counter)  # weights of the parallel edges behind every non-zero cell
+        self.update_adjacency_matrix(1, start=0)
+        return self.views["adjacency_matrix"]
+
+    def build_incidence_matrix(self):
+        self.views["incidence_matrix"] = SparseIncidence(self.V, oriented=not self.is_undirected)
+        self.update_incidence_matrix(1, start=0)
+        return self.views["incidence_matrix"]
+
+    def build_csr(self):
+        """
+        Build the CSR adjacency structure from the edges list: O(V+ElogE).
+        """
+        src, dst, weights = self.edge_arrays()
+        return CSRAdjacency.from_edges(self.V, src, dst, weights, self.is_undirected)
+
+    def edge_arrays(self, start=0):
+        """
+        The edges list from slot start onwards as NumPy arrays.
+        returns: (src, dst, weights), weights is None for graphs that are neither weighted nor labelled
+        """
+        if self._edges_list is None:
+            src, dst, weights = self._edge_arrays
+            return src[start:], dst[start:], (None if weights is None else weights[start:])
+        edges = self.edges_list[start:] if start else self.edges_list
+        n = len(edges)
+        src = np.fromiter((edge[0] for edge in edges), dtype=np.int64, count=n)
+        dst = np.fromiter((edge[1] for edge in edges), dtype=np.int64, count=n)
+        weights = None
+        if self.is_weighted or self.is_labelled:
+            weights = [edge[2] for edge in edges]
+            # one dtype for weights of one type, otherwise NumPy would turn 1 and 'a' into strings
+            weights = np.array(weights, dtype=None if len(set(map(type, weights))) <= 1 else object)
+        return src, dst, weights
+
+    def update_adjacency_list(self, operation, del_edges=[], start=None):
+        """
+        Update the adjacency list after adding or deleting edges.
+        operation: 1 for adding the edges from start (default=last_el_ptr) to the end of the edges list,
+                   0 for deleting del_edges
+        Time: O(1) per added edge, O(deg) per deleted edge
+        """
+        adjacency_list = self.views["adjacency_list"]
+        has_weight = self.is_weighted or self.is_labelled
         if operation == 1:
             # this for loop goes from the last(previous) edge added to the end of the new extended edge_list
+            edges_list = self.edges_list
             weight = 1
-            for i in range(self.last_el_ptr, len(self.edges_list)):
-                if self.is_weighted or self.is_labelled:
-                    weight = self.edges_list[i][2] #if labelled, weight is actually the label
-                self.adjacency_list[self.edges_list[i][0]].append(
-                    (self.edges_list[i][1], weight))
+            for i in range(self.last_el_ptr if start is None else start, len(edges_list)):
+                edge = edges_list[i]
+                if has_weight:
+                    weight = edge[2] #if labelled, weight is actually the label
+                adjacency_list[edge[0]].append((edge[1], weight))
                 if self.is_undirected:
-                    self.adjacency_list[self.edges_list[i][1]].append(
-                        (self.edges_list[i][0], weight))
-            # print(f"\nNew adj_list: {self.print_adjacency_list()}. \n Time = O(1)") #make display function to print properly
+                    adjacency_list[edge[1]].append((edge[0], weight))
         else:
-            for i in range(self.E, len(del_edges)):
-                self.adjacency_list[del_edges[i][0]].remove(del_edges[i][1])
+            weight = 1
+            for edge in del_edges:
+                if has_weight:
+                    weight = edge[2]
+                adjacency_list[edge[0]].remove((edge[1], weight))
                 if self.is_undirected:
-                    self.adjacency_list[del_edges[i]
-                                        [1]].remove(del_edges[i][0])
-            # print(f"\nNew adj_list: {self.print_adjacency_list()}. \n Time = O(V)")
+                    adjacency_list[edge[1]].remove((edge[0], weight))
 
-    def update_adjacency_matrix(self, operation, del_edges=[]):
+    def update_adjacency_matrix(self, operation, del_edges=[], start=None):
         """
-        Update the adjacency matrix after adding an edge.
-        operation: 1 for adding an edge, 0 for deleting an edge
+        Update the adjacency matrix after adding or deleting edges.
+        operation: 1 for adding the edges from start (default=last_el_ptr) to the end of the edges list,
+                   0 for deleting del_edges
+        Time: O(1) per edge
         """
+        adjacency_matrix = self.views["adjacency_matrix"]
         if operation == 1:
-            for i in range(self.last_el_ptr, len(self.edges_list)):
+            for i in range(self.last_el_ptr if start is None else start, len(self.edges_list)):
                 if self.is_weighted:
                     weight = self.edges_list[i][2]
                 else:
                     weight = 1
-                self.adjacency_matrix[self.edges_list[i]
-                                      [0]][self.edges_list[i][1]] = weight
+                pair_weights = self._matrix_pairs[self.matrix_pair(self.edges_list[i])]
+                # re-inserted so the last key is the weight in the cell, as a rebuild would leave it
+                pair_weights[weight] = pair_weights.pop(weight, 0) + 1
+                adjacency_matrix[self.edges_list[i]
+                                 [0]][self.edges_list[i][1]] = weight
                 if self.is_undirected:
-                    self.adjacency_matrix[self.edges_list[i]
-                                          [1]][self.edges_list[i][0]] = weight
-            # print(f"\nNew adjacency_matrix: {self.print_adjacency_matrix()}. \n Time = O(1)")
+                    adjacency_matrix[self.edges_list[i]
+                                     [1]][self.edges_list[i][0]] = weight
         else:
-            for i in range(len(del_edges)):
-                self.adjacency_matrix[del_edges[i][0]][del_edges[i][1]] = 0
-                self.adjacency_matrix[del_edges[i][1]][del_edges[i][0]] = 0
-            # print(f"\nNew adjacency_matrix: {self.print_adjacency_matrix()}. \n Time = O(1)")
+            for edge in del_edges:
+                pair_weights = self._matrix_pairs[self.matrix_pair(edge)]
+                weight = edge[2] if self.is_weighted else 1
+                pair_weights[weight] -= 1
+                if pair_weights[weight] == 0:
+                    del pair_weights[weight]
+                # a parallel edge still in the graph keeps its weight in the cell
+                weight = next(reversed(pair_weights), 0)
+                adjacency_matrix[edge[0]][edge[1]] = weight
+                if self.is_undirected:
+                    adjacency_matrix[edge[1]][edge[0]] = weight
 
-    def update_incidence_matrix(self, operation, del_edges=[]):
+    def matrix_pair(self, edge):
         """
-        Update the incidence matrix after adding an edge.
-        operation: 1 for adding an edge, 0 for deleting an edge
+        The adjacency matrix cell(s) an edge sets, as a hashable key.
         """
-        self.incidence_matrix = [
-            [0 for _ in range(len(self.edges_list))] for __ in range(self.V)]
+        if self.is_undirected:
+            return (min(edge[0], edge[1]), max(edge[0], edge[1]))
+        return (edge[0], edge[1])
 
+    def update_incidence_matrix(self, operation, del_slots=[], start=None):
+        """
+        Update the (sparse) incidence matrix after adding or deleting edges.
+        Column i of the incidence matrix is the edge in slot i of the edges list.
+        operation: 1 for appending the columns of the edges from start (default=last_el_ptr) to the end of the edges list,
+                   0 for removing the columns in del_slots, the last column is moved into the hole
+                   the same way update_edge_slots compacts the edges list.
+        Time: amortized O(1) per edge
+        """
+        incidence_matrix = self.views["incidence_matrix"]
         if operation == 1:
-            for i in range(len(self.edges_list)):
-                self.incidence_matrix[self.edges_list[i][0]][i] = 1
-                self.incidence_matrix[self.edges_list[i][1]][i] = 1
-            # print(f"\nNew incidence_matrix: {self.print_incidence_matrix()}. \n Time = O(V*E)")
+            start = self.last_el_ptr if start is None else start
+            if len(self.edges_list) - start == 1:
+                incidence_matrix.append(self.edges_list[start][0], self.edges_list[start][1])
+            else:
+                src, dst, _ = self.edge_arrays(start)
+                incidence_matrix.extend(src, dst)
         else:
-            for i in range(len(del_edges)):
-                edge_to_del = self.edges_list.index(del_edges[i])
-                self.incidence_matrix[del_edges[i][0]][edge_to_del] = 0
-                self.incidence_matrix[del_edges[i][1]][edge_to_del] = 0
-            # print(f"\nNew incidence_matrix: {self.print_incidence_matrix()}. \n Time = O(E)")
+            for slot in del_slots:
+                incidence_matrix.remove(slot)
+
+    def update_edge_slots(self, operation, del_slots=[]):
+        """
+        Keep the edges list and the edge -> slots hash index in sync.
+        operation: 1 for indexing the edges appended after last_el_ptr,
+                   0 for removing the edges in del_slots (in descending order) by moving the last edge into the hole
+        Time: O(1) per edge
+        """
+        edges_list = self.edges_list
+        if operation == 1:
+            if self._edge_slots is not None:
+                for i in range(self.last_el_ptr, len(edges_list)):
+                    self._edge_slots[edges_list[i]].append(i)
+        else:
+            for slot in del_slots:
+                last = len(edges_list) - 1
+                moved = edges_list.pop()
+                if slot != last:
+                    edges_list[slot] = moved
+                    moved_slots = self.edge_slots[moved]
+                    moved_slots[moved_slots.index(last)] = slot
 
     def update_all_views(self, operation, del_edges=[]):
         """
-        Sorts the edges list and then Update all the views after adding an edge.
-        operation: 1 for adding an edge, 0 for deleting an edge
+        Update the materialized views after adding or deleting edges.
+        With the list backend the views that are built and current are patched (only the touched rows and columns),
+        the others stay unbuilt until they are accessed. With the csr backend the views are left stale and
+        rebuilt once on the next access.
+        operation: 1 for the edges appended to the edges list after last_el_ptr,
+                   0 for deleting del_edges (already checked to be in the graph)
         """
-        self.edges_list.sort(
-            key=lambda x: x[0])  # sort the edges list: O(ElogE)
-        self.update_adjacency_list(operation, del_edges)
-        self.update_adjacency_matrix(operation, del_edges)
-        self.update_incidence_matrix(operation, del_edges)
+        patched = []
+        if self.storage == "list":
+            patched = [name for name, version in self.view_versions.items() if version == self.version]
+        if operation == 1:
+            if "adjacency_list" in patched:
+                self.update_adjacency_list(1)
+            if "adjacency_matrix" in patched:
+                self.update_adjacency_matrix(1)
+            if "incidence_matrix" in patched:
+                self.update_incidence_matrix(1)
+            self.update_edge_slots(1)
+        elif self.storage == "csr":
+            # no hash index here (it would cost more than the csr arrays), filter the edges list once
+            remaining = Counter(del_edges)
+            kept = []
+            for edge in self.edges_list:
+                if remaining[edge] > 0:
+                    remaining[edge] -= 1
+                else:
+                    kept.append(edge)
+            self.edges_list[:] = kept
+        else:
+            # the hash index gives the slot of every edge in O(1); deleting the highest slots first means
+            # the last edge moved into a hole is never one of the edges still to be deleted
+            if len(del_edges) == 1:
+                del_slots = [self.edge_slots[del_edges[0]].pop()]
+            else:
+                del_slots = sorted((self.edge_slots[edge].pop() for edge in del_edges), reverse=True)
+            if "adjacency_list" in patched:
+                self.update_adjacency_list(0, del_edges)
+            if "adjacency_matrix" in patched:
+                self.update_adjacency_matrix(0, del_edges)
+            if "incidence_matrix" in patched:
+                self.update_incidence_matrix(0, del_slots)
+            self.update_edge_slots(0, del_slots)
+        self.last_el_ptr = len(self.edges_list)
+        self.version += 1
+        for name in patched:
+            self.view_versions[name] = self.version
 
 
 class Graph(GraphView):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._batch = None  # (adds, deletes) queued inside a batch() block
+        self._layout_cache = (None, dict())  # (graph version, node -> position) of the last drawing
+
+    @classmethod
+    def from_arrays(cls, src, dst, weights=None, V=None, is_undirected=True, is_weighted=False, is_labelled=False,
+                    storage="csr"):
+        """
+        Build a graph straight from edge arrays, without creating a Python tuple per edge.
+        The arrays are kept as they are (they can be memory maps) until the edges list is needed.
+        src, dst: integer arrays with the end points of every edge
+        weights: (default=None) array of weights (or labels), required if is_weighted or is_labelled
+        V: (default=None) number of vertices, max vertex + 1 if not given
+        storage: (default="csr") storage backend, see GraphView
+        """
+        if (is_weighted or is_labelled) and weights is None:
+            raise ValueError("Weighted graph needs weights for the edges")
+        if len(src) != len(dst) or (weights is not None and len(weights) != len(src)):
+            raise ValueError("Edge arrays must have the same length")
+        if V is None:
+            V = int(max(src.max(), dst.max())) + 1 if len(src) else 0
+        graph = cls(V, len(src), [], is_undirected=is_undirected, is_weighted=is_weighted,
+                    is_labelled=is_labelled, storage=storage)
+        graph._edges_list = None
+        graph._edge_arrays = (src, dst, weights if (is_weighted or is_labelled) else None)
+        graph.last_el_ptr = len(src)
+        return graph
+
+    @classmethod
+    def from_labelled_edges(cls, edges, vertices=(), is_undirected=True, is_weighted=False, is_labelled=False,
+                            storage="list"):
+        """
+        Build a graph whose vertices are arbitrary hashable labels (strings, airport codes, 1-based ids...).
+        The labels are interned to dense ids 0..V-1 (graph.labels), the graph itself stores integer edges.
+        edges: list of (u, v) or (u, v, weight/label) tuples of vertex labels
+        vertices: (default=()) labels to intern first, e.g. isolated vertices or a fixed id order
+        """
+        labels = VertexLabels(vertices)
+        int_edges = labels.intern_edges(edges)
+        graph = cls(len(labels), len(int_edges), int_edges, is_undirected=is_undirected,
+                    is_weighted=is_weighted, is_labelled=is_labelled, storage=storage)
+        graph.labels = labels
+        return graph
+
+    @classmethod
+    def from_edge_file(cls, path, V=None, fmt=None, is_undirected=True, is_weighted=False, is_labelled=False,
+                       storage="csr", delimiter=None, chunk_size=1 << 20, dtype=np.int32):
+        """
+        Load a graph from an edge file.
+        path: edge file, see graph_io
+        fmt: (default=None) "text" (whitespace/CSV lines, parsed in chunks), "npy" or "bin" (raw values of dtype),
+             guessed from the extension if not given. Binary files are memory-mapped, not read.
+        delimiter, chunk_size: text format options, see graph_io.read_text_edges
+        dtype: (default=np.int32) value type of "bin" files
+        """
+        fmt = fmt or graph_io.edge_file_format(path)
+        if fmt == "text":
+            src, dst, weights = graph_io.read_text_edges(path, is_weighted, is_labelled, delimiter, chunk_size)
+        elif fmt in ("npy", "bin"):
+            src, dst, weights = graph_io.read_binary_edges(path, fmt, is_weighted, dtype)
+        else:
+            raise ValueError(f"Unknown edge file format: {fmt}")
+        return cls.from_arrays(src, dst, weights, V, is_undirected=is_undirected, is_weighted=is_weighted,
+                               is_labelled=is_labelled, storage=storage)
+
+    def save(self, path):
+        """
+        Save the graph as a binary snapshot (see graph_io.write_snapshot): the edge arrays, the flags,
+        the vertex labels and the array-backed views that are built (csr adjacency, incidence matrix).
+        The labels go to the JSON header with their types kept (see VertexLabels.to_json), a label type
+        that cannot be read back as the same label raises TypeError.
+        The list backend views are Python objects and are rebuilt on first access after load.
+        """
+        src, dst, weights = self.edge_arrays()
+        arrays = {"src": src, "dst": dst}
+        if weights is not None:
+            arrays["weights"] = weights
+        if self.storage == "csr" and self.is_materialized("adjacency_list"):
+            csr = self.views["adjacency_list"]
+            arrays["csr_offsets"], arrays["csr_targets"] = csr.offsets, csr.targets
+            if csr.weights is not None:
+                arrays["csr_weights"] = csr.weights
+        if self.is_materialized("incidence_matrix"):
+            incidence = self.views["incidence_matrix"]
+            arrays["incidence_src"], arrays["incidence_dst"] = incidence.src, incidence.dst
+            if incidence.signs is not None:
+                arrays["incidence_signs"] = incidence.signs
+        meta = {"V": self.V, "E": self.E, "is_undirected": self.is_undirected, "is_weighted": self.is_weighted,
+                "is_labelled": self.is_labelled, "storage": self.storage}
+        if self.labels is not None:
+            meta["labels"] = self.labels.to_json()  # raises TypeError before anything is written
+        graph_io.write_snapshot(path, meta, arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a graph saved with save. The arrays are memory-mapped, so loading only reads the header,
+        the saved views are used as they are, and processes loading the same file share its pages.
+        """
+        meta, arrays = graph_io.read_snapshot(path)
+        graph = cls.from_arrays(arrays["src"], arrays["dst"], arrays.get("weights"), meta["V"],
+                                is_undirected=meta["is_undirected"], is_weighted=meta["is_weighted"],
+                                is_labelled=meta["is_labelled"], storage=meta["storage"])
+        if "labels" in meta:
+            graph.labels = VertexLabels.from_json(meta["labels"])
+        if "csr_offsets" in arrays:
+            graph.views["adjacency_list"] = CSRAdjacency(
+                arrays["csr_offsets"], arrays["csr_targets"], arrays.get("csr_weights"))
+            graph.view_versions["adjacency_list"] = graph.version
+        if "incidence_src" in arrays:
+            graph.views["incidence_matrix"] = SparseIncidence.from_arrays(
+                graph.V, arrays["incidence_src"], arrays["incidence_dst"], arrays.get("incidence_signs"))
+            graph.view_versions["incidence_matrix"] = graph.version
+        return graph
 
     def add_edge(self, edge):
         """
@@ -133,6 +474,9 @@ class Graph(GraphView):
         edge: tuple of two vertices
         weight: weight of the edge, if the graph is weighted
         """
+        if self._batch is not None:
+            self._batch[0].append(edge)
+            return
         self.edges_list.append(edge)
         self.update_all_views(1)
         self.E += 1
@@ -145,54 +489,206 @@ class Graph(GraphView):
         if self.is_weighted:
             if len(edges[0]) == 2:
                 raise ValueError("Weighted graph needs weights for the edges")
+        if self._batch is not None:
+            self._batch[0].extend(edges)
+            return
         self.edges_list.extend(edges)
         self.update_all_views(1)
         self.E += len(edges)
 
-    def delete_edges(self, del_edges):
+    def has_edge(self, u, v, weight=None):
         """
-        Delete an edge from the graph.
-        edge: tuple of two vertices
+        Check if there is an edge from u to v, in either direction for undirected graphs.
+        weight: (default=None) weight (or label) the edge must have, None for any weight
+        Time: O(1) with the list backend when the weight is given or the graph is unweighted,
+              O(deg(u)) otherwise and with the csr backend
+        """
+        if not (0 <= u < self.V and 0 <= v < self.V):
+            return False
+        if self.storage == "csr":
+            csr = self.adjacency_list  # undirected edges are stored in both rows
+            start, end = csr.offsets[u], csr.offsets[u + 1]
+            found = csr.targets[start:end] == v
+            if weight is not None and csr.weights is not None:
+                found &= csr.weights[start:end] == weight
+            return bool(found.any())
+        if weight is None and (self.is_weighted or self.is_labelled):
+            return any(neighbor == v for neighbor, _ in self.adjacency_list[u])
+        extra = () if weight is None or not (self.is_weighted or self.is_labelled) else (weight,)
+        if self.edge_slots.get((u, v) + extra):
+            return True
+        return self.is_undirected and bool(self.edge_slots.get((v, u) + extra))
+
+    def check_deletable(self, del_edges, added_edges=()):
         """
-        for edge in del_edges:
-            if edge not in self.edges_list:
+        Raise ValueError if one of del_edges (counting repeats) is not in the graph or in added_edges.
+        """
+        if self.storage == "csr":
+            available = Counter(self.edges_list)
+        elif len(del_edges) == 1 and not added_edges:
+            # single-edge delete of a streaming update, no Counter needed
+            if not self.edge_slots.get(del_edges[0]):
+                raise ValueError("Edge not found in the graph")
+            return
+        else:
+            available = Counter({edge: len(self.edge_slots.get(edge, ())) for edge in del_edges})
+        available.update(added_edges)
+        for edge, count in Counter(del_edges).items():
+            if available.get(edge, 0) < count:
                 raise ValueError("Edge not found in the graph")
-            self.edges_list.remove(edge)
-        self.update_all_views(1, del_edges)
+
+    def delete_edges(self, del_edges):
+        """
+        Delete edges from the graph.
+        del_edges: list of edges, each a tuple as in the edges list
+        """
+        if self._batch is not None:
+            self._batch[1].extend(del_edges)
+            return
+        self.check_deletable(del_edges)
+        self.update_all_views(0, del_edges)
         self.E -= len(del_edges)
 
-    def print_graph_nx(self):
-        if self.is_weighted:
-            edges = [(edge[0], edge[1]) for edge in self.edges_list]
-        elif self.is_labelled:
-            edges = []
-            edge_labels = dict()
-            for edge in self.edges_list:
-                edges.append((edge[0], edge[1]))
-                edge_labels[(edge[0], edge[1])] = edge[2]
-        else:
+    def apply_changes(self, adds=(), deletes=()):
+        """
+        Apply a set of edge insertions and deletions in one pass.
+        The new edges are appended (no sorting), then the deletions are applied; a deletion may remove an edge
+        added by the same call. Nothing is applied if one of the deletions is not in the graph.
+        If the changes touch more edges than the graph holds, the built views are dropped and rebuilt once
+        on their next access, instead of being patched edge by edge.
+        adds: edges to add
+        deletes: edges to delete, each a tuple as in the edges list
+        """
+        adds, deletes = list(adds), list(deletes)
+        if self.is_weighted and adds and len(adds[0]) == 2:
+            raise ValueError("Weighted graph needs weights for the edges")
+        self.check_deletable(deletes, adds)
+        if len(adds) + len(deletes) > len(self.edges_list):
+            self.views.clear()
+        if adds:
+            self.edges_list.extend(adds)
+            self.update_all_views(1)
+        if deletes:
+            self.update_all_views(0, deletes)
+        self.E += len(adds) - len(deletes)
+
+    @contextmanager
+    def batch(self):
+        """
+        Queue add_edge, add_edges and delete_edges calls and apply them together with apply_changes
+        when the with block exits. Reads inside the block see the graph as it was before the batch.
+        If the block raises, the queued changes are discarded. Nested batches join the outer one.
+
+        with g.batch():
+            for edge in feed:
+                g.add_edge(edge)
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = ([], [])
+        try:
+            yield self
+            adds, deletes = self._batch
+        finally:
+            self._batch = None
+        self.apply_changes(adds, deletes)
+
+    def drawing_edges(self, max_nodes=None, max_edges=None, seed=0):
+        """
+        The (u, v) pairs to draw and the edge labels, optionally on a random sample of the graph.
+        max_nodes: (default=None) keep the subgraph induced by at most this many random vertices
+        max_edges: (default=None) keep at most this many random edges
+        returns: (edges, edge_labels), edge_labels is None unless the graph is labelled
+        """
+        if max_nodes is None and max_edges is None:
             edges = self.edges_list
+        else:
+            # sample on the arrays, so a graph loaded from arrays does not build its list of tuples
+            rng = np.random.default_rng(seed)
+            src, dst, weights = self.edge_arrays()
+            keep = np.arange(len(src))
+            if max_nodes is not None and max_nodes < self.V:
+                sampled = np.zeros(self.V, dtype=bool)
+                sampled[rng.choice(self.V, size=max_nodes, replace=False)] = True
+                keep = np.flatnonzero(sampled[src] & sampled[dst])
+            if max_edges is not None and max_edges < len(keep):
+                keep = np.sort(rng.choice(keep, size=max_edges, replace=False))
+            columns = [src[keep].tolist(), dst[keep].tolist()]
+            if weights is not None:
+                columns.append(weights[keep].tolist())
+            edges = list(zip(*columns))
+
+        edge_labels = None
+        if self.is_labelled:
+            edge_labels = {(edge[0], edge[1]): edge[2] for edge in edges}
+        if self.is_weighted or self.is_labelled:
+            edges = [(edge[0], edge[1]) for edge in edges]
+        return edges, edge_labels
+
+    def drawing_layout(self, G, seed=0, refine_iterations=10):
+        """
+        Spring layout positions for G, cached with the graph version.
+        An unchanged graph reuses the cached positions; after edits the cached positions are the starting point
+        of a short refinement (refine_iterations) instead of a full layout.
+        """
+        cached_version, cached_pos = self._layout_cache
+        if cached_version == self.version and all(v in cached_pos for v in G):
+            return {v: cached_pos[v] for v in G}
+        initial = {v: cached_pos[v] for v in G if v in cached_pos}
+        if initial:
+            pos = nx.spring_layout(G, pos=initial, iterations=refine_iterations, seed=seed)
+        else:
+            pos = nx.spring_layout(G, seed=seed)
+        cached_pos.update(pos)
+        self._layout_cache = (self.version, cached_pos)
+        return pos
+
+    def print_graph_nx(self, path=None, max_nodes=None, max_edges=None, seed=0, refine_iterations=10):
+        """
+        Draw the graph with networkx.
+        path: (default=None) image file (png, svg, pdf...) to render to with the Agg backend, without opening
+              a window, so it works on headless machines. If None the graph is shown with plt.show().
+        max_nodes, max_edges: (default=None) draw a random sample of the graph, see drawing_edges,
+              so previews of large graphs render in bounded time
+        seed: (default=0) seed of the sampling and of the layout
+        refine_iterations: (default=10) layout iterations after an edit, see drawing_layout
+        """
+        edges, edge_labels = self.drawing_edges(max_nodes, max_edges, seed)
 
         # Choose graph type based on directed/undirected attribute
         G = nx.MultiGraph() if self.is_undirected else nx.MultiDiGraph()
 
         G.add_edges_from(edges)
-        pos = nx.spring_layout(G)
+        pos = self.drawing_layout(G, seed, refine_iterations)
+
+        node_labels = None
+        if self.labels is not None:
+            node_labels = {v: self.labels.label_of(v) for v in G.nodes()}
 
-        plt.figure()
-        nx.draw(G, pos, with_labels=True, node_color='skyblue',
-                node_size=2000, edge_color='gray', font_size=15, font_color='black',
+        if path is None:
+            fig = plt.figure()
+        else:
+            # draw on a figure of its own with an Agg canvas: no pyplot state, no display needed
+            fig = Figure()
+            FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        large = G.number_of_nodes() > 100  # smaller nodes and no text, or the drawing is unreadable
+        nx.draw(G, pos, ax=ax, with_labels=not large, labels=node_labels, node_color='skyblue',
+                node_size=20 if large else 2000, edge_color='gray', font_size=15, font_color='black',
                 connectionstyle='arc3, rad = 0.1',
                 arrows=not self.is_undirected  # Add arrows if the graph is directed
                 )
 
-        if self.is_labelled and edge_labels:
-            nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_color="red")
-
-        plt.axis("off")
-        plt.title("Graph from Adjacency Matrix")
-        plt.show()
+        if edge_labels and not large:
+            nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_color="red", ax=ax)
 
+        ax.axis("off")
+        ax.set_title("Graph from Adjacency Matrix")
+        if path is None:
+            plt.show()
+        else:
+            fig.savefig(path)
 
 if __name__ == "__main__":
     # Example usage
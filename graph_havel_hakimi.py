@@ -57,7 +57,7 @@ g1 = Graph(V=5,
 
 g1.print_graph_nx()
 
-degree_seq = sorted([sum(x) for x in g1.adjacency_matrix], reverse=True)
+degree_seq = sorted([g1.degree(v) for v in range(g1.V)], reverse=True)
 print(degree_seq)
 
 if check_graphical(degree_seq):
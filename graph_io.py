@@ -0,0 +1,145 @@
+import itertools
+import json
+import os
+import numpy as np
+
+
+def edge_file_format(path):
+    """
+    Guess the format of an edge file from its extension: "npy", "bin" or "text".
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return "npy"
+    if extension in (".bin", ".raw"):
+        return "bin"
+    return "text"
+
+
+def split_edge_columns(edges, is_weighted=False):
+    """
+    Split an (E, 2) or (E, 3) edge array into column views (no copy).
+    returns: (src, dst, weights), weights is None unless is_weighted
+    """
+    if edges.ndim != 2 or edges.shape[1] not in (2, 3):
+        raise ValueError(f"Edge array must have 2 or 3 columns, got shape {edges.shape}")
+    if is_weighted and edges.shape[1] != 3:
+        raise ValueError("Weighted graph needs weights for the edges")
+    weights = edges[:, 2] if is_weighted else None
+    return edges[:, 0], edges[:, 1], weights
+
+
+def read_binary_edges(path, fmt="npy", is_weighted=False, dtype=np.int32):
+    """
+    Open a binary edge array with a memory map, so no edge is read before it is used.
+    path: .npy file holding an (E, 2) or (E, 3) array, or a raw file of row-major values
+    fmt: (default="npy") "npy" or "bin" (raw values of the given dtype, 2 per edge, 3 if weighted)
+    returns: (src, dst, weights) column views into the memory map
+    """
+    if fmt == "npy":
+        edges = np.load(path, mmap_mode="r")
+    else:
+        edges = np.memmap(path, dtype=dtype, mode="r")
+        edges = edges.reshape(-1, 3 if is_weighted else 2)
+    return split_edge_columns(edges, is_weighted)
+
+
+def read_text_edges(path, is_weighted=False, is_labelled=False, delimiter=None, chunk_size=1 << 20):
+    """
+    Parse a whitespace separated (or CSV) edge list: one "u v" or "u v weight/label" line per edge.
+    Lines are parsed chunk_size at a time with NumPy, no Python tuple is created per edge.
+    Lines starting with # are skipped.
+    path: text file
+    delimiter: (default=None) None for whitespace, "," for CSV (picked automatically for .csv files)
+    chunk_size: (default=2^20) number of lines parsed at once
+    returns: (src, dst, weights), weights is None unless the graph is weighted or labelled
+    """
+    if delimiter is None and path.lower().endswith(".csv"):
+        delimiter = ","
+    src_chunks, dst_chunks, weight_chunks = [], [], []
+    with open(path) as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                break
+            if not any(line.split("#", 1)[0].strip() for line in lines):
+                continue  # only comments and blank lines, np.loadtxt would warn about an empty input
+            ends = np.loadtxt(lines, dtype=np.int64, delimiter=delimiter, usecols=(0, 1), ndmin=2)
+            src_chunks.append(ends[:, 0])
+            dst_chunks.append(ends[:, 1])
+            if is_weighted:
+                weight_chunks.append(np.loadtxt(lines, dtype=np.float64, delimiter=delimiter, usecols=2, ndmin=1))
+            elif is_labelled:
+                weight_chunks.append(np.loadtxt(lines, dtype=str, delimiter=delimiter, usecols=2, ndmin=1))
+
+    if not src_chunks:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, (np.empty(0) if is_weighted or is_labelled else None)
+    src = np.concatenate(src_chunks)
+    dst = np.concatenate(dst_chunks)
+    weights = np.concatenate(weight_chunks) if weight_chunks else None
+    return src, dst, weights
+
+
+SNAPSHOT_MAGIC = b"GRAPHSNP"
+SNAPSHOT_ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return -(-offset // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+
+def write_snapshot(path, meta, arrays):
+    """
+    Write a snapshot: a binary container of named NumPy arrays plus a JSON header.
+    Layout: magic (8 bytes), header length (uint64), JSON header, then the raw bytes of every array,
+    each starting at a 64-byte aligned offset so it can be memory-mapped in place.
+    meta: JSON-serializable dict stored in the header
+    arrays: dict name -> array (numeric or fixed-width string dtypes, no object arrays)
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    for name, array in arrays.items():
+        if array.dtype.hasobject:
+            raise ValueError(f"Array {name!r} has Python objects and cannot be saved in a snapshot")
+
+    # the header holds the offsets, which depend on the header length: lay the arrays out after a
+    # generous upper bound of the header size
+    table = {name: {"dtype": array.dtype.str, "shape": list(array.shape), "offset": 0}
+             for name, array in arrays.items()}
+    header_size = len(json.dumps({"meta": meta, "arrays": table}).encode()) + 32 * len(arrays) + 64
+    offset = _aligned(len(SNAPSHOT_MAGIC) + 8 + header_size)
+    for name, array in arrays.items():
+        table[name]["offset"] = offset
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({"meta": meta, "arrays": table}).encode().ljust(header_size)
+
+    with open(path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(np.uint64(header_size).tobytes())
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(table[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(offset)
+
+
+def read_snapshot(path):
+    """
+    Open a snapshot written by write_snapshot. The arrays are copy-on-write memory maps: nothing is read until
+    it is used, pages are shared between processes loading the same file, and writes stay private.
+    returns: (meta, dict name -> array)
+    """
+    with open(path, "rb") as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a graph snapshot")
+        header_size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        header = json.loads(f.read(header_size))
+
+    arrays = dict()
+    for name, info in header["arrays"].items():
+        shape = tuple(info["shape"])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=info["dtype"])
+        else:
+            arrays[name] = np.memmap(path, dtype=info["dtype"], mode="c", offset=info["offset"], shape=shape)
+    return header["meta"], arrays
@@ -0,0 +1,103 @@
+import numpy as np
+
+
+class VertexLabels():
+    """
+    Interning table between arbitrary hashable vertex labels ('A', 'JFK', ...) and dense
+    integer ids 0..n-1, in the order the labels were first seen.
+    Algorithms work on the integer ids (lists and arrays indexed by vertex) and only
+    translate back to labels at the boundary.
+    """
+
+    def __init__(self, labels=()):
+        """
+        labels: (default=()) labels to intern, in order
+        """
+        self._labels = []  # id -> label
+        self._ids = dict()  # label -> id
+        for label in labels:
+            self.intern(label)
+
+    def intern(self, label):
+        """
+        The id of label, adding it to the table if it is new: O(1).
+        """
+        vertex_id = self._ids.get(label)
+        if vertex_id is None:
+            vertex_id = len(self._labels)
+            self._ids[label] = vertex_id
+            self._labels.append(label)
+        return vertex_id
+
+    def intern_many(self, labels):
+        """
+        Intern every label, returns their ids as an int64 array.
+        """
+        return np.fromiter((self.intern(label) for label in labels), dtype=np.int64)
+
+    def id_of(self, label):
+        """
+        The id of a label already in the table.
+        """
+        try:
+            return self._ids[label]
+        except KeyError:
+            raise ValueError(f"Unknown vertex label: {label!r}") from None
+
+    def label_of(self, vertex_id):
+        return self._labels[vertex_id]
+
+    def labels_of(self, vertex_ids):
+        """
+        Translate a sequence of ids back to labels.
+        """
+        return [self._labels[vertex_id] for vertex_id in vertex_ids]
+
+    def intern_edges(self, edges):
+        """
+        Translate a list of (u, v) or (u, v, weight) edges to ids, interning new labels.
+        Extra fields (weights or labels) are kept as they are.
+        """
+        return [(self.intern(edge[0]), self.intern(edge[1])) + tuple(edge[2:]) for edge in edges]
+
+    def to_json(self):
+        """
+        The labels, in id order, as a JSON-serializable list: str, int, float, bool and None labels are kept
+        as they are, a tuple becomes {"tuple": [...]} so it is not read back as a list.
+        Raises TypeError for any other label type, it would not come back as the same label.
+        """
+        return [_encode_label(label) for label in self._labels]
+
+    @classmethod
+    def from_json(cls, labels):
+        """
+        Rebuild the table from the list made by to_json.
+        """
+        return cls(_decode_label(label) for label in labels)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def __contains__(self, label):
+        return label in self._ids
+
+    def __iter__(self):
+        return iter(self._labels)
+
+
+JSON_LABEL_TYPES = (str, int, float, bool, type(None))
+
+
+def _encode_label(label):
+    if type(label) is tuple:
+        return {"tuple": [_encode_label(item) for item in label]}
+    if type(label) not in JSON_LABEL_TYPES:
+        raise TypeError(f"Vertex label {label!r} of type {type(label).__name__} cannot be saved, "
+                        f"labels must be str, int, float, bool, None or tuples of them")
+    return label
+
+
+def _decode_label(label):
+    if isinstance(label, dict):
+        return tuple(_decode_label(item) for item in label["tuple"])
+    return label
@@ -1,5 +1,282 @@
+import heapq
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from graph_base import *
+from graph_unionfind import UnionFind
+import numpy as np
+
+
+class GraphOverlay():
+    """
+    Lazy result of a GraphOps operation over two graphs (Graph objects or other overlays), returned with lazy=True.
+    Nothing is copied: neighbors, has_edge and degree combine the rows of the two operands when they are asked,
+    so chained operations allocate nothing until materialize() builds the Graph in one pass over the packed
+    edge keys. As in the materialized result, an edge is identified by (u, v, weight) and appears once.
+    """
+
+    ROW_OPERATIONS = {
+        "union": set.union,
+        "intersection": set.intersection,
+        "difference": set.difference,
+        "ringsum": set.symmetric_difference,
+    }
+
+    def __init__(self, operation, g1, g2):
+        """
+        operation: "union", "intersection", "difference" or "ringsum"
+        g1, g2: operands, Graph objects (from graph_base.py) or overlays
+        """
+        if operation not in self.ROW_OPERATIONS:
+            raise ValueError(f"Unknown graph operation: {operation!r}")
+        self.operation = operation
+        self.g1, self.g2 = g1, g2
+        self.V = max(g1.V, g2.V)
+        # same flags as the materialized result, see GraphOps.graph_from_keys
+        self.is_undirected = g1.is_undirected
+        self.is_weighted = g1.is_weighted
+        self.is_labelled = True
+        self.storage = g1.storage
+
+    @staticmethod
+    def operand_row(g, v):
+        """
+        Row v of an operand as a set of (neighbour, weight) entries, weight 1 for unweighted graphs.
+        """
+        if isinstance(g, GraphOverlay):
+            return g.entries(v)
+        if isinstance(g, ContractedGraph):
+            return set(g.row(v))
+        if v >= g.V:
+            return set()
+        return set(g.adjacency_list[v])
+
+    def entries(self, v):
+        """
+        Set of the distinct (neighbour, weight) entries of vertex v: O(deg) in both operands.
+        """
+        return self.ROW_OPERATIONS[self.operation](self.operand_row(self.g1, v), self.operand_row(self.g2, v))
+
+    def row(self, v):
+        """
+        The (neighbour, weight) entries of vertex v as in the adjacency list of the materialized result:
+        every distinct entry once, by increasing neighbour, and a self loop of an undirected graph twice
+        (once per end point), so degree and neighbors agree with materialize().
+        """
+        entries = self.entries(v)
+        row = sorted(entries, key=lambda entry: entry[0])
+        if self.is_undirected:
+            loops = [i for i, (neighbor, _) in enumerate(row) if neighbor == v]
+            for i in reversed(loops):
+                row.insert(i, row[i])
+        return row
+
+    def neighbors(self, v):
+        """
+        Neighbours of vertex v, without the weights, in increasing order.
+        """
+        return [neighbor for neighbor, _ in self.row(v)]
+
+    def degree(self, v):
+        """
+        Degree of vertex v (out-degree for directed graphs).
+        """
+        return len(self.row(v))
+
+    def has_edge(self, u, v, weight=None):
+        """
+        Check if there is an edge from u to v, like Graph.has_edge: the rows of undirected operands hold
+        both directions, so (v, u) is found as well.
+        weight: (default=None) weight (or label) the edge must have, None for any weight
+        """
+        if not (0 <= u < self.V and 0 <= v < self.V):
+            return False
+        return any(neighbor == v and weight in (None, entry_weight) for neighbor, entry_weight in self.row(u))
+
+    def edges(self):
+        """
+        Generate the (u, v, weight) edges one vertex at a time, with u <= v for undirected graphs.
+        """
+        for u in range(self.V):
+            for v, weight in sorted(self.entries(u), key=lambda entry: entry[0]):
+                if self.is_undirected and v < u:
+                    continue
+                yield (u, v, weight)
+
+    def leaves(self):
+        """
+        The Graph objects under this overlay.
+        """
+        leaves = dict()  # by identity: a graph used twice in a chain is read once
+        for g in (self.g1, self.g2):
+            for leaf in (g.leaves() if isinstance(g, GraphOverlay) else [g]):
+                leaves[id(leaf)] = leaf
+        return list(leaves.values())
+
+    def keys(self, ops, V, weight_codes, is_undirected, leaf_keys=None):
+        """
+        Sorted, duplicate-free packed edge keys of the result (see GraphOps.edge_keys).
+        weight_codes: dict weight -> code shared by the leaves, see GraphOps.shared_weight_codes
+        leaf_keys: (default=None) dict id(graph) -> keys, so a graph used twice in a chain is packed once
+        """
+        if leaf_keys is None:
+            leaf_keys = dict()
+        operands = []
+        for g in (self.g1, self.g2):
+            if isinstance(g, GraphOverlay):
+                operands.append(g.keys(ops, V, weight_codes, is_undirected, leaf_keys))
+                continue
+            if id(g) not in leaf_keys:
+                leaf_keys[id(g)] = ops.graph_keys(g, V, weight_codes, is_undirected)
+            operands.append(leaf_keys[id(g)])
+        return getattr(ops, self.operation + "_keys")(*operands)
+
+    def materialize(self):
+        """
+        Build the result as a Graph object.
+        """
+        ops = GraphOps()
+        weight_codes = ops.shared_weight_codes(self.leaves())
+        if self.V * self.V * len(weight_codes) >= 2 ** 63:
+            raise ValueError("Too many vertices and distinct weights to pack the edges into int64 keys")
+        keys = self.keys(ops, self.V, weight_codes, self.is_undirected)
+        return ops.graph_from_keys(keys, self.V, ops.weight_table(weight_codes), self)
+
+
+class ContractedGraph():
+    """
+    Lazy vertex contraction of a graph (Graph object or GraphOverlay): contracted vertices are merged in a
+    union-find relabeling layer, in near-constant time per pair, and the edges are only rewritten when they are
+    read. Every set of merged vertices is represented by one of its vertices (its union-find root), the edges
+    keep their weights, parallel edges are kept and an edge inside a merged set becomes a self loop.
+    """
+
+    def __init__(self, g, pairs=(), drop_loops=False):
+        """
+        g: Graph object (from graph_base.py) or GraphOverlay to contract
+        pairs: (default=()) (u, v) vertex pairs to merge, see contract
+        drop_loops: (default=False) leave out the self loops created by the contraction (and the existing ones)
+        """
+        self.g = g
+        self.V = g.V
+        self.is_undirected = g.is_undirected
+        self.is_weighted = g.is_weighted
+        self.is_labelled = g.is_labelled
+        self.storage = g.storage
+        self.drop_loops = drop_loops
+        self.sets = UnionFind(g.V)
+        self.members = dict()  # root -> vertices of its set, only for sets of 2 or more vertices
+        self.contract(pairs)
+
+    def contract(self, pairs):
+        """
+        Merge the vertices of every (u, v) pair: O(1) amortized per pair (plus moving the member list of the
+        smaller set). Can be called again to contract more pairs.
+        returns: self
+        """
+        for u, v in pairs:
+            root, absorbed = self.sets.union(u, v)
+            if absorbed is not None:
+                members = self.members.setdefault(root, [root])
+                members.extend(self.members.pop(absorbed, [absorbed]))
+        return self
+
+    def copy(self):
+        """
+        Contraction of the same graph with its own copy of the merged sets, so contracting the copy further
+        leaves this one unchanged: O(V).
+        """
+        other = ContractedGraph(self.g, drop_loops=self.drop_loops)
+        other.sets = self.sets.copy()
+        other.members = {root: list(members) for root, members in self.members.items()}
+        return other
+
+    def representative(self, v):
+        """
+        The vertex standing for the contracted set of v.
+        """
+        return self.sets.find(v)
+
+    def vertex_map(self):
+        """
+        Representative of every vertex as an int64 array.
+        """
+        return self.sets.roots()
+
+    def row(self, v):
+        """
+        Rewritten (neighbour, weight) entries of v: O(sum of the degrees of its members) for a representative.
+        An absorbed vertex has no entry, its edges belong to its representative, as in materialize().
+        """
+        find = self.sets.find
+        if find(v) != v:
+            return []
+        entries = []
+        for member in self.members.get(v, [v]):
+            if isinstance(self.g, GraphOverlay):
+                base_row = self.g.row(member)
+            else:
+                base_row = self.g.adjacency_list[member]
+            for neighbor, weight in base_row:
+                neighbor = find(neighbor)
+                if not (self.drop_loops and neighbor == v):
+                    entries.append((neighbor, weight))
+        return entries
+
+    def neighbors(self, v):
+        """
+        Neighbours of v as representatives, none if v was absorbed by another vertex.
+        """
+        return [neighbor for neighbor, _ in self.row(v)]
+
+    def degree(self, v):
+        return len(self.row(v))
+
+    def has_edge(self, u, v, weight=None):
+        """
+        Check if there is an edge from u to v, like Graph.has_edge (in either direction for undirected graphs).
+        Only representatives have edges: an absorbed vertex has none, as in materialize().
+        weight: (default=None) weight (or label) the edge must have, None for any weight
+        """
+        if not (0 <= u < self.V and 0 <= v < self.V):
+            return False
+        return any(neighbor == v and weight in (None, entry_weight) for neighbor, entry_weight in self.row(u))
+
+    def base_graph(self):
+        return self.g.materialize() if isinstance(self.g, GraphOverlay) else self.g
+
+    def edge_arrays(self):
+        """
+        The rewritten edges as (src, dst, weights) arrays, like Graph.edge_arrays, so a ContractedGraph can be
+        an operand of the other GraphOps operations.
+        """
+        return self.rewrite(self.base_graph())
+
+    def rewrite(self, g):
+        """
+        Replace the end points of the edges of g by their representatives.
+        """
+        src, dst, weights = g.edge_arrays()
+        roots = self.vertex_map()
+        src = roots[np.asarray(src, dtype=np.int64)]
+        dst = roots[np.asarray(dst, dtype=np.int64)]
+        if self.drop_loops:
+            keep = src != dst
+            src, dst = src[keep], dst[keep]
+            weights = None if weights is None else weights[keep]
+        return src, dst, weights
+
+    def materialize(self):
+        """
+        Build the contracted graph as a Graph object: every edge end point is replaced by its representative
+        in one vectorized pass. The absorbed vertices keep their ids but have no edge left.
+        """
+        g = self.base_graph()
+        src, dst, weights = self.rewrite(g)
+        graph = Graph.from_arrays(src, dst, weights, V=g.V, is_undirected=g.is_undirected,
+                                  is_weighted=g.is_weighted, is_labelled=g.is_labelled, storage=g.storage)
+        graph.labels = g.labels
+        return graph
 
 
 class GraphOps():
@@ -23,168 +300,541 @@ class GraphOps():
                 edges_list.append((node, neighbor[0], neighbor[1]))
         return edges_list
 
-    def union(self, g1, g2):
-        """Computes the union of two graphs represented as adjacency lists.
-        g1: Graph object (from graph_base.py) of graph 1
-        g2: Graph object (from graph_base.py) of graph 2
-
-        returns: R, a Graph object of the union of g1 and g2
-        """
-        g1_adjlist = g1.adjacency_list
-        g2_adjlist = g2.adjacency_list
-
-        # Find the number of vertices in the union graph
-        R_vertices = set()
-        for node, edges in enumerate(g1_adjlist):
-            R_vertices.add(node)
-        for node, edges in enumerate(g2_adjlist):
-            R_vertices.add(node)
-
-        R_adjlist = [set() for _ in range(len(R_vertices))]  # list of sets
-        for node, edges in enumerate(g1_adjlist):
-            for edge in edges:
-                R_adjlist[node].add(edge)
-        for node, edges in enumerate(g2_adjlist):
-            for edge in edges:
-                R_adjlist[node].add(edge)
-
-        R_adjdict = dict(enumerate(R_adjlist))
-        R_edges = self.get_edges_list(R_adjdict)
-        R = Graph(
-            V=len(R_vertices),
-            E=len(R_edges),
-            is_weighted=g1.is_weighted,
-            is_undirected=g1.is_undirected,
-            edges=R_edges,
-            is_labelled=True
-        )
-
-        return R
-
-    def intersection(self, g1, g2):
-        """Computes the R of two graphs represented as adjacency lists.
-        g1: Graph object (from graph_base.py) of graph 1
-        g2: Graph object (from graph_base.py) of graph 2
-
-        returns: R, a Graph object of the intersection of g1 and g2
-        """
-        g1_adjlist = g1.adjacency_list
-        g2_adjlist = g2.adjacency_list
-
-        # Find the common vertices
-        R_vertices = set()
-        for node, edges in enumerate(g1_adjlist):
-            R_vertices.add(node)
-        for node, edges in enumerate(g2_adjlist):
-            R_vertices.add(node)
-
-        R_adjlist = [set() for _ in range(len(R_vertices))]  # list of sets
-        for node, edges in enumerate(g1_adjlist):
-            for edge in edges:
-                if edge in g2_adjlist[node]:
-                    R_adjlist[node].add(edge)
-
-        R_adjlist = dict(enumerate(R_adjlist))
-        R_edges = self.get_edges_list(R_adjlist)
-        R = Graph(
-            V=len(R_vertices),
-            E=len(R_edges),
-            is_weighted=g1.is_weighted,
-            is_undirected=g1.is_undirected,
-            edges=R_edges,
-            is_labelled=True
-        )
-
-        return R
-
-    def difference(self, g1, g2):
-        """Computes the difference of two graphs represented as adjacency lists.
-        g1: Graph object (from graph_base.py) of graph 1
-        g2: Graph object (from graph_base.py) of graph 2
-
-        returns: R, a Graph object of the difference of g1 and g2
-        """
-        g1_adjlist = g1.adjacency_list
-        g2_adjlist = g2.adjacency_list
-
-        # Find the number of vertices in the difference graph
-        R_vertices = set()
-        for node, edges in enumerate(g1_adjlist):
-            R_vertices.add(node)
-        for node, edges in enumerate(g2_adjlist):
-            R_vertices.add(node)
-
-        R_adjlist = [set() for _ in range(len(R_vertices))]  # list of sets
-        for node, edges in enumerate(g1_adjlist):
-            for edge in edges:
-                if edge not in g2_adjlist[node]:
-                    R_adjlist[node].add(edge)
-
-        R_adjlist = dict(enumerate(R_adjlist))
-        R_edges = self.get_edges_list(R_adjlist)
-        R = Graph(
-            V=len(R_vertices),
-            E=len(R_edges),
-            edges=R_edges,
-            is_weighted=g1.is_weighted,
-            is_undirected=g1.is_undirected,
-            is_labelled=True
-        )
-        return R
-
-    def ringsum(self, g1, g2):
-        """Computes the ringsum of two graphs represented as adjacency lists.
-        g1: Graph object (from graph_base.py) of graph 1
-        g2: Graph object (from graph_base.py) of graph 2
-
-        returns: R, a Graph object of the ringsum of g1 and g2
-        """
-        # R_adjlist = defaultdict(set)
-        # R_graph_vertices = set()
-        R_union = self.union(g1, g2)
-        R_intersection = self.intersection(g1, g2)
-        R = self.difference(R_union, R_intersection)
-        return R
-
-    def fusion(self, g1, g2, v1, v2):
-        """Computes the fusion of two graphs represented as adjacency lists.
-        g1: Graph object (from graph_base.py) of graph 1
-        g2: Graph object (from graph_base.py) of graph 2
-        v1: vertex of g1
-        v2: vertex of g2
+    def edge_columns(self, g, is_undirected):
+        """
+        The edges of g as int64 (src, dst) arrays plus its weights array (None for unweighted graphs),
+        with u <= v for undirected graphs so each edge has one orientation.
+        """
+        src, dst, weights = g.edge_arrays()
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if is_undirected:
+            src, dst = np.minimum(src, dst), np.maximum(src, dst)
+        return src, dst, weights
+
+    def sorted_unique(self, keys):
+        """
+        Sort keys and drop the duplicates: O(nlogn).
+        """
+        keys = np.sort(keys)
+        if len(keys):
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        return keys
 
-        returns: R, a Graph object of the fusion of g1 and g2
+    def sorted_contains(self, sorted_keys, keys):
+        """
+        Boolean mask of the keys found in sorted_keys, by binary search: O(nlogm).
         """
-        R_fusion = self.union(g1, g2)
-        R_fusion.add_edge((v1, v2))
-        return R_fusion
+        if not len(sorted_keys):
+            return np.zeros(len(keys), dtype=bool)
+        positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+        return sorted_keys[positions] == keys
 
-gops = GraphOps()
+    def edge_keys(self, g1, g2):
+        """
+        Pack the edges of both graphs into sorted, duplicate-free int64 keys.
+        An edge is identified by (u, v, weight), like the (neighbour, weight) entries of the adjacency lists:
+        key = (u * V + v) * n_weights + code of the weight, codes shared by both graphs.
+        g1, g2: Graph objects (from graph_base.py)
 
-# when labelled, the third val in edge list is label. Label is a char
-g1 = Graph(V=5,
-           E=6,
-           edges=[(0, 1, "a"), (0, 2, "b"), (1, 2, "c"),
-                  (1, 3, "d"), (2, 4, "e"), (3, 4, "f")],
-           is_labelled=True)
+        returns: (keys1, keys2, V, weight_table), weight_table maps a weight code back to the weight
+        """
+        keys1, keys2, V, weight_table = self.packed_keys(g1, g2)
+        return self.sorted_unique(keys1), self.sorted_unique(keys2), V, weight_table
 
-g2 = Graph(V=6,
-           E=6,
-           edges=[(0, 1, "a"), (0, 2, "g"), (1, 2, "c"), (1, 5, "h"), (2, 5, "k"), (5, 4,"l")],
-           is_labelled=True)
+    def packed_keys(self, g1, g2):
+        """
+        Same as edge_keys, but the keys are left in edge order, with their duplicates.
+        """
+        V = max(g1.V, g2.V)
+        columns = [self.edge_columns(g, g1.is_undirected) for g in (g1, g2)]
+        weight_codes = dict()
+        codes = [self.intern_weights(weights, weight_codes) for _, _, weights in columns]
+        n_weights = max(len(weight_codes), 1)
+        if V * V * n_weights >= 2 ** 63:
+            raise ValueError("Too many vertices and distinct weights to pack the edges into int64 keys")
+
+        keys = [(src * V + dst) * n_weights + code for (src, dst, _), code in zip(columns, codes)]
+        return keys[0], keys[1], V, self.weight_table(weight_codes)
+
+    def intern_weights(self, weights, weight_codes):
+        """
+        Codes of the weights of one graph in a table shared by the operands. The distinct weights of the graph
+        are found with NumPy, then interned as Python values, so the weights of two graphs are never converted
+        to one dtype (an int weight stays an int next to float weights, 1 is not turned into a '1' label),
+        and 1 and 1.0 share a code as they did in the adjacency list sets.
+        weights: array of weights (or labels), None if every edge weighs 1
+        weight_codes: dict weight -> code, the new weights take the next codes
+
+        returns: int64 array with the code of every weight (one code if weights is None)
+        """
+        if weights is None:
+            return weight_codes.setdefault(1, len(weight_codes))
+        weights = np.asarray(weights)
+        if weights.dtype == object:
+            # weights of mixed types (e.g. the result of an earlier operation) cannot be sorted by np.unique
+            return np.fromiter((weight_codes.setdefault(weight, len(weight_codes)) for weight in weights.tolist()),
+                               dtype=np.int64, count=len(weights))
+        values, inverse = np.unique(weights, return_inverse=True)
+        lookup = np.fromiter((weight_codes.setdefault(value, len(weight_codes)) for value in values.tolist()),
+                             dtype=np.int64, count=len(values))
+        return lookup[inverse.ravel()]
+
+    def weight_table(self, weight_codes):
+        """
+        Array mapping a weight code back to its weight (see intern_weights): of the weights' own dtype when
+        they all have one type, an object array otherwise, so every weight keeps its value and type.
+        """
+        weights = list(weight_codes)
+        if len({type(weight) for weight in weights}) <= 1:
+            return np.array(weights)
+        table = np.empty(len(weights), dtype=object)
+        table[:] = weights
+        return table
+
+    def weight_lookup(self, weight_codes):
+        """
+        The weights of a complete weight_codes table sorted, with their codes, to look up many blocks of weights
+        by binary search instead of interning each block. None if the weights have mixed types and cannot be
+        sorted together.
+        returns: (sorted weights, codes) arrays or None
+        """
+        table = self.weight_table(weight_codes)
+        if table.dtype == object:
+            return None
+        order = np.argsort(table, kind="stable")
+        return table[order], order.astype(np.int64)
+
+    def graph_keys(self, g, V, weight_codes, is_undirected):
+        """
+        Sorted, duplicate-free packed edge keys of one graph, with the codes of a shared weight_codes table
+        (see shared_weight_codes).
+        """
+        src, dst, weights = self.edge_columns(g, is_undirected)
+        code = self.intern_weights(weights, weight_codes)
+        return self.sorted_unique((src * V + dst) * len(weight_codes) + code)
+
+    def union_keys(self, keys1, keys2):
+        return self.sorted_unique(np.concatenate((keys1, keys2)))
 
-# g1.print_graph_nx()
-# g2.print_graph_nx()
-print(g1.adjacency_list)
-R_union = gops.union(g1, g2)
-R_union.print_graph_nx()
+    def intersection_keys(self, keys1, keys2):
+        return keys1[self.sorted_contains(keys2, keys1)]
 
-R_intersection = gops.intersection(g1, g2)
-R_intersection.print_graph_nx()
+    def difference_keys(self, keys1, keys2):
+        return keys1[~self.sorted_contains(keys2, keys1)]
 
-R_difference = gops.difference(g1, g2)
-R_difference.print_graph_nx()
+    def ringsum_keys(self, keys1, keys2):
+        """
+        Keys in exactly one of the two sorted, duplicate-free key arrays.
+        After merging them a key in both appears twice in a row and a key in only one appears once.
+        """
+        merged = np.concatenate((keys1, keys2))
+        merged.sort(kind="stable")  # two sorted runs: a linear merge
+        single = np.ones(len(merged), dtype=bool)
+        repeated = merged[1:] == merged[:-1]
+        single[1:] &= ~repeated
+        single[:-1] &= ~repeated
+        return merged[single]
+
+    def operation_keys(self, operation, g1, g2, workers=1):
+        """
+        Packed edge keys of the result of an operation ("union", "intersection", "difference" or "ringsum").
+        workers: (default=1) number of processes, see parallel_keys
+
+        returns: (keys, V, weight_table), see edge_keys
+        """
+        if workers > 1:
+            keys1, keys2, V, weight_table = self.packed_keys(g1, g2)
+            span = V * max(len(weight_table), 1)
+            return self.parallel_keys(operation, keys1, keys2, V, span, workers), V, weight_table
+        keys1, keys2, V, weight_table = self.edge_keys(g1, g2)
+        return getattr(self, operation + "_keys")(keys1, keys2), V, weight_table
+
+    def shard_partition(self, keys, V, span, n_shards):
+        """
+        Reorder packed keys by source-vertex range in O(n): shard i holds the edges whose source is in
+        [V * i // n_shards, V * (i + 1) // n_shards), i.e. the keys in [first source * span, last source * span).
+        Stable radix sort on the small shard numbers, the keys are not sorted.
+        returns: (partitioned keys, offsets), shard i is partitioned[offsets[i]:offsets[i + 1]]
+        """
+        bounds = (V * np.arange(1, n_shards, dtype=np.int64) // n_shards) * span
+        shard = np.searchsorted(bounds, keys, side="right").astype(np.uint16)
+        offsets = np.zeros(n_shards + 1, dtype=np.int64)
+        np.cumsum(np.bincount(shard, minlength=n_shards), out=offsets[1:])
+        return keys[np.argsort(shard, kind="stable")], offsets
 
-R_ringsum = gops.ringsum(g1, g2)
-R_ringsum.print_graph_nx()
-# plt.show()
+    def parallel_keys(self, operation, keys1, keys2, V, span, workers, shards_per_worker=4):
+        """
+        Run an operation on source-vertex-range shards in a process pool.
+        Both key arrays are partitioned by source range (see shard_partition) into shared memory, every worker
+        sorts and combines its shard pair in place and writes the result into a shared output array, so no edge
+        array is pickled. A source vertex is in one shard only, so the sorted shard results concatenate into
+        the sorted result.
+        keys1, keys2: packed keys of both graphs, unsorted, with duplicates (see packed_keys)
+        span: size of the key range of one source vertex (V * n_weights)
+        workers: number of processes
+        shards_per_worker: (default=4) more shards than workers, to even out the load when the degrees are skewed
+
+        returns: sorted int64 array of the result keys
+        """
+        n_shards = max(1, min(workers * shards_per_worker, V, np.iinfo(np.uint16).max))
+        part1, offsets1 = self.shard_partition(keys1, V, span, n_shards)
+        part2, offsets2 = self.shard_partition(keys2, V, span, n_shards)
+
+        blocks = []
+        try:
+            shared = []
+            for array in (part1, part2, np.empty(len(part1) + len(part2), dtype=np.int64)):
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                np.ndarray(array.shape, dtype=np.int64, buffer=block.buf)[:] = array
+                shared.append((block.name, len(array)))
+            del part1, part2
+
+            tasks = [(i, offsets1[i], offsets1[i + 1], offsets2[i], offsets2[i + 1]) for i in range(n_shards)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                counts = list(pool.map(run_shard, [operation] * n_shards, [shared] * n_shards, tasks))
+
+            output = np.ndarray((shared[2][1],), dtype=np.int64, buffer=blocks[2].buf)
+            result = np.concatenate([output[start1 + start2:start1 + start2 + count]
+                                     for (_, start1, _, start2, _), count in zip(tasks, counts)])
+            del output
+            return result
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def lazy_result(self, operation, g1, g2, lazy):
+        """
+        The result as a GraphOverlay if lazy, else materialized (operands that are overlays are combined
+        in the same pass, without intermediate graphs).
+        """
+        overlay = GraphOverlay(operation, g1, g2)
+        return overlay if lazy else overlay.materialize()
+
+    def graph_from_keys(self, keys, V, weight_table, g1):
+        """
+        Build the result Graph straight from packed edge keys (see edge_keys), in array form.
+        The result takes its flags and storage backend from g1.
+        """
+        n_weights = max(len(weight_table), 1)
+        uv, code = np.divmod(keys, n_weights)
+        src, dst = np.divmod(uv, V)
+        weights = weight_table[code] if len(weight_table) else np.ones(0, dtype=np.int64)
+        return Graph.from_arrays(src, dst, weights, V=V, is_undirected=g1.is_undirected,
+                                 is_weighted=g1.is_weighted, is_labelled=True, storage=g1.storage)
+
+    def union(self, g1, g2, lazy=False, workers=1):
+        """Computes the union of two graphs on their sorted, packed edge keys.
+        g1: Graph object (from graph_base.py) or GraphOverlay of graph 1
+        g2: Graph object (from graph_base.py) or GraphOverlay of graph 2
+        lazy: (default=False) return a GraphOverlay answering queries on demand instead of a new Graph
+        workers: (default=1) number of processes, more than 1 splits the work by source-vertex range
+                 (see parallel_keys)
+
+        returns: R, a Graph object (or GraphOverlay) of the union of g1 and g2
+        """
+        if lazy or isinstance(g1, GraphOverlay) or isinstance(g2, GraphOverlay):
+            return self.lazy_result("union", g1, g2, lazy)
+        keys, V, weight_table = self.operation_keys("union", g1, g2, workers)
+        return self.graph_from_keys(keys, V, weight_table, g1)
+
+    def intersection(self, g1, g2, lazy=False, workers=1):
+        """Computes the intersection of two graphs on their sorted, packed edge keys.
+        g1: Graph object (from graph_base.py) or GraphOverlay of graph 1
+        g2: Graph object (from graph_base.py) or GraphOverlay of graph 2
+        lazy: (default=False) return a GraphOverlay answering queries on demand instead of a new Graph
+        workers: (default=1) number of processes, more than 1 splits the work by source-vertex range
+                 (see parallel_keys)
+
+        returns: R, a Graph object (or GraphOverlay) of the intersection of g1 and g2
+        """
+        if lazy or isinstance(g1, GraphOverlay) or isinstance(g2, GraphOverlay):
+            return self.lazy_result("intersection", g1, g2, lazy)
+        keys, V, weight_table = self.operation_keys("intersection", g1, g2, workers)
+        return self.graph_from_keys(keys, V, weight_table, g1)
+
+    def difference(self, g1, g2, lazy=False, workers=1):
+        """Computes the difference of two graphs on their sorted, packed edge keys.
+        g1: Graph object (from graph_base.py) or GraphOverlay of graph 1
+        g2: Graph object (from graph_base.py) or GraphOverlay of graph 2
+        lazy: (default=False) return a GraphOverlay answering queries on demand instead of a new Graph
+        workers: (default=1) number of processes, more than 1 splits the work by source-vertex range
+                 (see parallel_keys)
+
+        returns: R, a Graph object (or GraphOverlay) of the difference of g1 and g2
+        """
+        if lazy or isinstance(g1, GraphOverlay) or isinstance(g2, GraphOverlay):
+            return self.lazy_result("difference", g1, g2, lazy)
+        keys, V, weight_table = self.operation_keys("difference", g1, g2, workers)
+        return self.graph_from_keys(keys, V, weight_table, g1)
+
+    def ringsum(self, g1, g2, lazy=False, workers=1):
+        """Computes the ringsum (symmetric difference) of two graphs in one pass over their edge keys.
+        g1: Graph object (from graph_base.py) or GraphOverlay of graph 1
+        g2: Graph object (from graph_base.py) or GraphOverlay of graph 2
+        lazy: (default=False) return a GraphOverlay answering queries on demand instead of a new Graph
+        workers: (default=1) number of processes, more than 1 splits the work by source-vertex range
+                 (see parallel_keys)
+
+        returns: R, a Graph object (or GraphOverlay) of the ringsum of g1 and g2
+        """
+        if lazy or isinstance(g1, GraphOverlay) or isinstance(g2, GraphOverlay):
+            return self.lazy_result("ringsum", g1, g2, lazy)
+        keys, V, weight_table = self.operation_keys("ringsum", g1, g2, workers)
+        return self.graph_from_keys(keys, V, weight_table, g1)
+
+    def shared_weight_codes(self, graphs):
+        """
+        Codes of the distinct weights of all graphs (edges of unweighted graphs weigh 1), see intern_weights,
+        built one graph at a time.
+        returns: dict weight -> code
+        """
+        weight_codes = dict()
+        for g in graphs:
+            _, _, weights = g.edge_arrays()
+            self.intern_weights(weights, weight_codes)
+        return weight_codes
+
+    def key_stream(self, g, V, weight_codes, block_size):
+        """
+        Generate the packed edge keys of g (see edge_keys) in increasing order, as sorted duplicate-free blocks.
+        The CSR rows are read block_size entries at a time: a block covers a range of source vertices, so the
+        blocks come out in key order and only one of them is in memory at a time.
+        g must use the csr backend: its own CSR arrays are read, never a copy.
+        """
+        csr = g.adjacency_list
+        n_weights = len(weight_codes)
+        lookup = self.weight_lookup(weight_codes)
+        offsets = csr.offsets
+        row = 0
+        while row < len(csr):
+            # rows [row, end) hold about block_size entries, at least one row
+            end = int(np.searchsorted(offsets, offsets[row] + block_size, side="right")) - 1
+            end = min(max(end, row + 1), len(csr))
+            start, stop = offsets[row], offsets[end]
+            src = np.repeat(np.arange(row, end, dtype=np.int64), np.diff(offsets[row:end + 1]))
+            dst = np.asarray(csr.targets[start:stop], dtype=np.int64)
+            if csr.weights is not None and lookup is not None:
+                code = lookup[1][np.searchsorted(lookup[0], csr.weights[start:stop])]
+            else:
+                code = self.intern_weights(None if csr.weights is None else csr.weights[start:stop], weight_codes)
+            keys = (src * V + dst) * n_weights + code
+            if g.is_undirected:
+                keys = keys[dst >= src]  # undirected rows hold both directions, keep u <= v
+            row = end
+            if len(keys):
+                yield self.sorted_unique(keys)
+
+    def merge_counts(self, streams, min_count):
+        """
+        k-way merge of sorted, duplicate-free key streams, keeping the keys found in at least min_count of them.
+        A heap orders the streams by the last key of their current block: every stream has already loaded all
+        its keys up to the smallest of these, so the keys up to it are final and are counted together.
+        That stream then moves on to its next block.
+        Memory: the output plus one block (the cursor) per stream.
+        streams: iterators of sorted key blocks (see key_stream)
+        min_count: number of streams a key must appear in (every key is kept if it is 1 or less)
+
+        returns: (keys, counts), the sorted kept keys and the number of streams holding each, int64 arrays
+        """
+        blocks = dict()
+        heap = []
+        for i, stream in enumerate(streams):
+            block = next(stream, None)
+            if block is not None:
+                blocks[i] = block
+                heap.append((block[-1], i))
+        heapq.heapify(heap)
+
+        kept, kept_counts = [], []
+        while heap:
+            bound = heap[0][0]
+            if len(heap) < min_count:
+                break  # the keys left are in fewer than min_count streams
+            taken = []
+            for i, block in blocks.items():
+                cut = int(np.searchsorted(block, bound, side="right"))
+                taken.append(block[:cut])
+                blocks[i] = block[cut:]
+            while heap and heap[0][0] == bound:
+                _, i = heapq.heappop(heap)
+                block = next(streams[i], None)
+                if block is None:
+                    del blocks[i]
+                else:
+                    blocks[i] = block
+                    heapq.heappush(heap, (block[-1], i))
+
+            merged = np.concatenate(taken)
+            merged.sort()
+            if not len(merged):
+                continue
+            # every key appears at most once per stream: count the runs of equal keys
+            starts = np.flatnonzero(np.concatenate(([True], merged[1:] != merged[:-1])))
+            counts = np.diff(np.append(starts, len(merged)))
+            keep = counts >= min_count
+            kept.append(merged[starts[keep]])
+            kept_counts.append(counts[keep])
+        if not kept:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(kept), np.concatenate(kept_counts)
+
+    def add_key_counts(self, keys, counts, graph_keys):
+        """
+        Count one more graph: merge its sorted, duplicate-free keys into the sorted keys and their counts.
+        returns: (keys, counts) of both
+        """
+        merged = np.union1d(keys, graph_keys)
+        merged_counts = np.zeros(len(merged), dtype=np.int64)
+        merged_counts[np.searchsorted(merged, keys)] = counts
+        merged_counts[np.searchsorted(merged, graph_keys)] += 1
+        return merged, merged_counts
+
+    def union_many(self, graphs, min_count=1, block_size=1 << 16):
+        """Computes the union of any number of graphs in one k-way merge of their sorted edge streams,
+        without the intermediate graphs of a pairwise reduction.
+        The CSR rows of the csr backend graphs are already sorted, so they are streamed in place: the memory
+        stays the output plus one block per graph. The rows of the list backend graphs are not sorted, so these
+        are packed one at a time (one sorted key array, see graph_keys), counted and dropped; the counts only
+        hold the keys that can still be found in min_count graphs.
+        graphs: list of Graph objects (from graph_base.py), the result takes its flags from the first one
+        min_count: (default=1) keep only the edges found in at least this many graphs ("k of N");
+                   1 is the union, len(graphs) the intersection
+        block_size: (default=2^16) number of adjacency entries read from a graph at a time
+
+        returns: R, a Graph object with the edges found in at least min_count of the graphs
+        """
+        graphs = list(graphs)
+        if not graphs:
+            raise ValueError("union_many needs at least one graph")
+        if not 1 <= min_count <= len(graphs):
+            raise ValueError(f"min_count must be between 1 and {len(graphs)}, got {min_count}")
+        V = max(g.V for g in graphs)
+        weight_codes = self.shared_weight_codes(graphs)
+        if V * V * len(weight_codes) >= 2 ** 63:
+            raise ValueError("Too many vertices and distinct weights to pack the edges into int64 keys")
+
+        list_graphs = [g for g in graphs if g.storage != "csr"]
+        streams = [self.key_stream(g, V, weight_codes, block_size) for g in graphs if g.storage == "csr"]
+        # a key of the csr graphs can still get the rest of its count from the list backend graphs
+        keys, counts = self.merge_counts(streams, min_count - len(list_graphs))
+        for i, g in enumerate(list_graphs):
+            keys, counts = self.add_key_counts(keys, counts, self.graph_keys(g, V, weight_codes, g.is_undirected))
+            reachable = counts + (len(list_graphs) - i - 1) >= min_count
+            keys, counts = keys[reachable], counts[reachable]
+        return self.graph_from_keys(keys, V, self.weight_table(weight_codes), graphs[0])
+
+    def intersection_many(self, graphs, block_size=1 << 16):
+        """Computes the intersection of any number of graphs in one k-way merge of their sorted edge streams.
+        graphs: list of Graph objects (from graph_base.py), the result takes its flags from the first one
+        block_size: (default=2^16) number of adjacency entries read from a graph at a time
+
+        returns: R, a Graph object with the edges found in every graph
+        """
+        graphs = list(graphs)
+        return self.union_many(graphs, min_count=max(len(graphs), 1), block_size=block_size)
+
+    def contract(self, g, pairs, lazy=False, drop_loops=None):
+        """Contracts many vertex pairs of a graph at once, through a union-find relabeling layer.
+        g: Graph object (from graph_base.py), GraphOverlay or ContractedGraph (a copy of it is contracted further,
+           g is left as it is)
+        pairs: list of (u, v) vertex pairs to merge
+        lazy: (default=False) return the ContractedGraph, whose edges are rewritten when they are read,
+              instead of a new Graph
+        drop_loops: (default=None) leave out the self loops (edges inside a merged set) if True, keep them if False;
+                    None keeps the setting of a ContractedGraph g and the loops of any other graph
+
+        returns: R, a Graph object (or ContractedGraph) with every pair merged into one vertex
+        """
+        if isinstance(g, ContractedGraph):
+            contracted = g.copy()
+            if drop_loops is not None:
+                contracted.drop_loops = drop_loops
+            contracted.contract(pairs)
+        else:
+            contracted = ContractedGraph(g, pairs, bool(drop_loops))
+        return contracted if lazy else contracted.materialize()
+
+    def fusion(self, g1, g2, v1, v2, lazy=False):
+        """Computes the fusion of two graphs: their union with the vertices v1 and v2 identified
+        (merged into v1, the edges of v2 now end at v1, an edge between them becomes a self loop).
+        g1: Graph object (from graph_base.py) or GraphOverlay of graph 1
+        g2: Graph object (from graph_base.py) or GraphOverlay of graph 2
+        v1: vertex of g1
+        v2: vertex of g2
+        lazy: (default=False) return a ContractedGraph over the lazy union instead of a new Graph
+
+        returns: R, a Graph object (or ContractedGraph) of the fusion of g1 and g2
+        """
+        return self.contract(self.union(g1, g2, lazy=True), [(v1, v2)], lazy=lazy)
+
+def attach_shared_array(name, length):
+    """
+    Open a shared memory block created by another process as an int64 array.
+    returns: (block, array), close the block once the array is no longer used
+    """
+    # pool workers share the resource tracker of the process that created the block,
+    # which unlinks it once (see parallel_keys)
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray((length,), dtype=np.int64, buffer=block.buf)
+
+
+def run_shard(operation, shared, task):
+    """
+    Worker of GraphOps.parallel_keys: combine one shard of both key arrays and write the sorted result
+    into the shared output array, at the shard's offset (start1 + start2, room for both shards).
+    shared: [(name, length)] of the partitioned keys1, keys2 and the output array
+    task: (shard, start1, end1, start2, end2)
+    returns: number of result keys written
+    """
+    _, start1, end1, start2, end2 = task
+    blocks, arrays = [], []
+    try:
+        for name, length in shared:
+            block, array = attach_shared_array(name, length)
+            blocks.append(block)
+            arrays.append(array)
+        ops = GraphOps()
+        keys1 = ops.sorted_unique(arrays[0][start1:end1])  # sorted copies, the shared input is left as it is
+        keys2 = ops.sorted_unique(arrays[1][start2:end2])
+        result = getattr(ops, operation + "_keys")(keys1, keys2)
+        arrays[2][start1 + start2:start1 + start2 + len(result)] = result
+        return len(result)
+    finally:
+        arrays.clear()  # a block cannot be closed while an array still uses its buffer
+        for block in blocks:
+            block.close()
+
+
+if __name__ == "__main__":
+    gops = GraphOps()
+
+    # when labelled, the third val in edge list is label. Label is a char
+    g1 = Graph(V=5,
+               E=6,
+               edges=[(0, 1, "a"), (0, 2, "b"), (1, 2, "c"),
+                      (1, 3, "d"), (2, 4, "e"), (3, 4, "f")],
+               is_labelled=True)
+
+    g2 = Graph(V=6,
+               E=6,
+               edges=[(0, 1, "a"), (0, 2, "g"), (1, 2, "c"), (1, 5, "h"), (2, 5, "k"), (5, 4,"l")],
+               is_labelled=True)
+
+    # g1.print_graph_nx()
+    # g2.print_graph_nx()
+    print(g1.adjacency_list)
+    R_union = gops.union(g1, g2)
+    R_union.print_graph_nx()
+
+    R_intersection = gops.intersection(g1, g2)
+    R_intersection.print_graph_nx()
+
+    R_difference = gops.difference(g1, g2)
+    R_difference.print_graph_nx()
+
+    R_ringsum = gops.ringsum(g1, g2)
+    R_ringsum.print_graph_nx()
+    # plt.show()
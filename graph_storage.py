@@ -0,0 +1,232 @@
+import numpy as np
+
+
+class CSRAdjacency():
+    """
+    Compressed sparse row (CSR) adjacency structure, array-backed with NumPy.
+    The neighbours of vertex v are targets[offsets[v]:offsets[v+1]], and their
+    weights (or labels) are the same slice of weights.
+    Memory: O(V + E), instead of O(V*V) for the adjacency matrix.
+    """
+
+    def __init__(self, offsets, targets, weights=None):
+        """
+        offsets: int64 array of length V+1
+        targets: integer array of length offsets[-1], the neighbour of every slot
+        weights: (default=None) array aligned with targets, None for unweighted graphs
+        """
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, V, src, dst, weights=None, is_undirected=True):
+        """
+        Build the CSR structure from edge arrays.
+        V: number of vertices
+        src, dst: integer arrays with the end points of every edge
+        weights: (default=None) array with the weight/label of every edge
+        is_undirected: (default=True) store every edge in both directions
+        """
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if is_undirected:
+            # interleave (u, v) and (v, u) so every row keeps the edge list order,
+            # just like the list backend does
+            src, dst = np.stack((src, dst), axis=1).ravel(), np.stack((dst, src), axis=1).ravel()
+            if weights is not None:
+                weights = np.repeat(np.asarray(weights), 2)
+
+        order = np.argsort(src, kind="stable")  # O(ElogE), stable keeps the edge order in a row
+        index_dtype = np.int32 if V < np.iinfo(np.int32).max else np.int64
+        targets = dst[order].astype(index_dtype)
+        if weights is not None:
+            weights = np.asarray(weights)[order]
+
+        offsets = np.zeros(V + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=V), out=offsets[1:])
+        return cls(offsets, targets, weights)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, v):
+        """
+        Row v in the same format as the list backend: a list of (neighbour, weight) tuples.
+        """
+        start, end = self.offsets[v], self.offsets[v + 1]
+        targets = self.targets[start:end].tolist()
+        if self.weights is None:
+            return [(t, 1) for t in targets]
+        return list(zip(targets, self.weights[start:end].tolist()))
+
+    def __iter__(self):
+        for v in range(len(self)):
+            yield self[v]
+
+    def neighbors(self, v):
+        """
+        Neighbours of vertex v, as a read-only view into the targets array (no copy).
+        """
+        return self.targets[self.offsets[v]:self.offsets[v + 1]]
+
+    def degree(self, v):
+        return int(self.offsets[v + 1] - self.offsets[v])
+
+    def degrees(self):
+        """
+        Degree of every vertex as an array.
+        """
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the arrays, in bytes.
+        """
+        total = self.offsets.nbytes + self.targets.nbytes
+        if self.weights is not None:
+            total += self.weights.nbytes
+        return total
+
+    def toarray(self):
+        """
+        Dense V x V adjacency matrix, only meant for small graphs.
+        """
+        V = len(self)
+        dense = np.zeros((V, V), dtype=np.int64 if self.weights is None else self.weights.dtype)
+        rows = np.repeat(np.arange(V), self.degrees())
+        dense[rows, self.targets] = 1 if self.weights is None else self.weights
+        return dense
+
+
+class SparseIncidence():
+    """
+    Incidence matrix in sparse coordinate (COO) form: column i is edge i, with its two
+    non-zeros in rows src[i] and dst[i]. For directed graphs a sign array orients every
+    column: signs[i] on the source row and -signs[i] on the destination row.
+    Memory: O(E), instead of O(V*E) for the dense matrix.
+    Columns are appended in amortized O(1) (capacity doubling) and removed in O(1)
+    by moving the last column into the hole, the same way the edges list is compacted.
+    """
+
+    def __init__(self, V, oriented=False, capacity=16):
+        """
+        V: number of vertices (rows)
+        oriented: (default=False) keep a sign array, for directed graphs
+        capacity: (default=16) initial number of columns allocated
+        """
+        self.V = V
+        self.n_columns = 0
+        index_dtype = np.int32 if V < np.iinfo(np.int32).max else np.int64
+        self._src = np.empty(capacity, dtype=index_dtype)
+        self._dst = np.empty(capacity, dtype=index_dtype)
+        self._signs = np.empty(capacity, dtype=np.int8) if oriented else None
+
+    @classmethod
+    def from_edges(cls, V, src, dst, oriented=False):
+        incidence = cls(V, oriented, capacity=max(len(src), 16))
+        incidence.extend(src, dst)
+        return incidence
+
+    @classmethod
+    def from_arrays(cls, V, src, dst, signs=None):
+        """
+        Wrap existing column arrays (e.g. memory maps) without copying them.
+        """
+        incidence = cls(V, oriented=signs is not None, capacity=0)
+        incidence._src, incidence._dst, incidence._signs = src, dst, signs
+        incidence.n_columns = len(src)
+        return incidence
+
+    @property
+    def src(self):
+        return self._src[:self.n_columns]
+
+    @property
+    def dst(self):
+        return self._dst[:self.n_columns]
+
+    @property
+    def signs(self):
+        return None if self._signs is None else self._signs[:self.n_columns]
+
+    @property
+    def shape(self):
+        return (self.V, self.n_columns)
+
+    @property
+    def nbytes(self):
+        total = self.src.nbytes + self.dst.nbytes
+        if self._signs is not None:
+            total += self.signs.nbytes
+        return total
+
+    def _reserve(self, n_columns):
+        if n_columns <= len(self._src):
+            return
+        capacity = max(n_columns, 2 * len(self._src))
+        self._src = np.resize(self._src, capacity)
+        self._dst = np.resize(self._dst, capacity)
+        if self._signs is not None:
+            self._signs = np.resize(self._signs, capacity)
+
+    def append(self, u, v):
+        """
+        Append the column of edge (u, v): amortized O(1).
+        """
+        self._reserve(self.n_columns + 1)
+        self._src[self.n_columns] = u
+        self._dst[self.n_columns] = v
+        if self._signs is not None:
+            self._signs[self.n_columns] = -1
+        self.n_columns += 1
+
+    def extend(self, src, dst):
+        """
+        Append the columns of all the edges (src[i], dst[i]).
+        """
+        start, end = self.n_columns, self.n_columns + len(src)
+        self._reserve(end)
+        self._src[start:end] = src
+        self._dst[start:end] = dst
+        if self._signs is not None:
+            self._signs[start:end] = -1
+        self.n_columns = end
+
+    def remove(self, column):
+        """
+        Remove a column by moving the last column into it: O(1).
+        """
+        last = self.n_columns - 1
+        if column != last:
+            self._src[column] = self._src[last]
+            self._dst[column] = self._dst[last]
+            if self._signs is not None:
+                self._signs[column] = self._signs[last]
+        self.n_columns = last
+
+    def column(self, i):
+        """
+        The two rows with a non-zero in column i.
+        """
+        return int(self._src[i]), int(self._dst[i])
+
+    def toarray(self):
+        """
+        Dense V x E matrix, only meant for small graphs.
+        """
+        dense = np.zeros(self.shape, dtype=np.int8)
+        columns = np.arange(self.n_columns)
+        if self._signs is None:
+            dense[self.src, columns] = 1
+            dense[self.dst, columns] = 1
+        else:
+            # np.add.at so the two entries of a self loop cancel out
+            np.add.at(dense, (self.src, columns), self.signs)
+            np.add.at(dense, (self.dst, columns), -self.signs)
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.toarray()
+        return dense if dtype is None else dense.astype(dtype)
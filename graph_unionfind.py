@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class UnionFind():
+    """
+    Disjoint sets over the elements 0..n-1 (union by size, path halving):
+    find and union run in near-constant amortized time.
+    """
+
+    def __init__(self, n):
+        """
+        n: number of elements, every element starts in a set of its own
+        """
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.n_sets = n
+
+    def find(self, v):
+        """
+        Representative (root) of the set of v.
+        """
+        parent = self.parent
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]  # path halving
+            v = parent[v]
+        return v
+
+    def union(self, u, v):
+        """
+        Merge the sets of u and v. The root of the larger set stays the representative
+        (the root of u on a tie).
+        returns: (root, absorbed), absorbed is the root that was merged away, None if u and v were already together
+        """
+        root, absorbed = self.find(u), self.find(v)
+        if root == absorbed:
+            return root, None
+        if self.size[root] < self.size[absorbed]:
+            root, absorbed = absorbed, root
+        self.parent[absorbed] = root
+        self.size[root] += self.size[absorbed]
+        self.n_sets -= 1
+        return root, absorbed
+
+    def copy(self):
+        """
+        Independent copy of the sets: O(n).
+        """
+        other = UnionFind(0)
+        other.parent = list(self.parent)
+        other.size = list(self.size)
+        other.n_sets = self.n_sets
+        return other
+
+    def connected(self, u, v):
+        return self.find(u) == self.find(v)
+
+    def roots(self):
+        """
+        The representative of every element as an int64 array, by pointer jumping on the parent array
+        (O(n) per round, O(log n) rounds), without a Python call per element.
+        """
+        parent = np.asarray(self.parent, dtype=np.int64)
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                return parent
+            parent = grand
+
+    def __len__(self):
+        return len(self.parent)
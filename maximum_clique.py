@@ -19,25 +19,233 @@ def is_clique(graph, subset):
             return False
     return True
 
-# Function to find the maximum clique
+def index_graph(graph):
+    """
+    Number the vertices of an adjacency dict 0..n-1 (in key order, then neighbours that are not keys)
+    and build the undirected neighbour sets, without self loops.
+    Returns:
+        tuple: (vertices, neighbors), vertices[i] is the vertex with index i, neighbors[i] a set of indices.
+    """
+    index = {v: i for i, v in enumerate(graph)}
+    if set().union(*graph.values()).difference(index):
+        for adjacent in graph.values():
+            for v in adjacent:
+                index.setdefault(v, len(index))
+    neighbors = [set(map(index.__getitem__, adjacent)) for adjacent in graph.values()]
+    neighbors += [set() for _ in range(len(index) - len(neighbors))]
+    for i, adjacent in enumerate(neighbors):
+        adjacent.discard(i)
+        for j in adjacent:
+            neighbors[j].add(i)  # an edge listed at one end only
+    return list(index), neighbors
+
+
+def degeneracy_order(neighbors):
+    """
+    Repeatedly remove a vertex of minimum degree (bucket queue): O(V+E).
+    Every vertex has at most `degeneracy` neighbours later in the order, so a clique search rooted at each
+    vertex over its later neighbours only works on small subproblems in sparse graphs.
+    Args:
+        neighbors (list): neighbour sets of the vertices 0..n-1.
+    Returns:
+        tuple: (order, core), core[v] is the core number of v, a clique containing v has at most core[v] + 1 vertices.
+    """
+    n = len(neighbors)
+    degree = [len(adjacent) for adjacent in neighbors]
+    buckets = [set() for _ in range(max(degree, default=0) + 1)]
+    for v in range(n):
+        buckets[degree[v]].add(v)
+    removed = [False] * n
+    order, core = [], [0] * n
+    i = k = 0
+    for _ in range(n):
+        while not buckets[i]:
+            i += 1
+        v = buckets[i].pop()
+        k = max(k, i)
+        core[v] = k
+        order.append(v)
+        removed[v] = True
+        for u in neighbors[v]:
+            if not removed[u]:
+                buckets[degree[u]].remove(u)
+                degree[u] -= 1
+                buckets[degree[u]].add(u)
+        i = max(i - 1, 0)
+    return order, core
+
+
+def iter_bits(mask):
+    """
+    Indices of the set bits of an int used as a vertex set, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def color_bound(candidates, masks, limit):
+    """
+    Greedy coloring of the candidate set: a clique has at most one vertex per color class, so the number of
+    colors is an upper bound on the clique that the candidates can add.
+    Stops counting once it is above limit (the bound is then good enough to go on).
+    """
+    colors = 0
+    while candidates and colors <= limit:
+        colors += 1
+        available = candidates
+        while available:
+            low = available & -available
+            available &= ~masks[low.bit_length() - 1] & ~low  # the rest of the class is not adjacent to it
+            candidates &= ~low
+    return colors
+
+
+def inverse_order(order):
+    """
+    position[v] is the index of v in order.
+    """
+    position = [0] * len(order)
+    for i, v in enumerate(order):
+        position[v] = i
+    return position
+
+
+def root_subproblem(v, neighbors, position):
+    """
+    The cliques whose first vertex (in degeneracy order) is v: its later neighbours are the candidates and its
+    earlier ones are excluded. The subproblem is renumbered 0..k-1 over the neighbours of v, later ones first,
+    so its bitsets have deg(v) bits only.
+    Args:
+        position (list): position of every vertex in the degeneracy order, see inverse_order.
+    Returns:
+        tuple: (local, masks, candidates, excluded), local[i] is the vertex with local index i and
+               masks[i] its neighbours in the subproblem.
+    """
+    later = [u for u in neighbors[v] if position[u] > position[v]]
+    earlier = [u for u in neighbors[v] if position[u] < position[v]]
+    local = later + earlier
+    local_index = {u: i for i, u in enumerate(local)}
+    local_set = neighbors[v]
+    masks = []
+    for u in local:
+        mask = 0
+        for w in neighbors[u] & local_set:  # set intersection, only the edges inside the subproblem
+            mask |= 1 << local_index[w]
+        masks.append(mask)
+    return local, masks, (1 << len(later)) - 1, ((1 << len(earlier)) - 1) << len(later)
+
+
+def later_degrees(neighbors, position):
+    """
+    Number of neighbours of every vertex later in the degeneracy order: a clique whose first vertex is v
+    has at most later_degrees[v] + 1 vertices.
+    """
+    return [sum(position[u] > position[v] for u in neighbors[v]) for v in range(len(neighbors))]
+
+
 def find_maximal_clique(graph):
     """
-    Find the largest clique using a brute-force approach.
-    Loops through all possible sizes of subsets of vertices, starting from largest(n) to smallest(1).
-    For each size, it creates combinations of vertices of that size and checks if they form a clique. 
-    The fisrst clique found is returned, and so it will be the largest one. 
+    Find the largest clique with a branch-and-bound Bron–Kerbosch search.
+    The search is split into one subproblem per vertex in degeneracy order (see root_subproblem), vertex sets
+    are ints used as bitsets. Each branch expands only the candidates that are not adjacent to a Tomita pivot
+    (the vertex with most neighbours among the candidates), and is cut as soon as a greedy coloring of its
+    candidates shows it cannot beat the best clique found so far.
+    Args:
+        graph (dict): Graph as an adjacency list.
+    Returns:
+        tuple: The largest clique found, its vertices in the order of the graph's keys.
+    """
+    vertices, neighbors = index_graph(graph)
+    if not vertices:
+        return None  # Return None if graph is empty
+    order, _ = degeneracy_order(neighbors)
+    position = inverse_order(order)
+    bounds = later_degrees(neighbors, position)
+    best = [order[0]]
+
+    def expand(clique, candidates, excluded, masks, local):
+        # clique: root vertex then local indices
+        if not candidates:
+            if len(clique) > len(best):
+                best[:] = clique[:1] + [local[u] for u in clique[1:]]
+            return
+        if len(clique) + color_bound(candidates, masks, len(best) - len(clique)) <= len(best):
+            return
+        pivot = max(iter_bits(candidates | excluded), key=lambda u: (candidates & masks[u]).bit_count())
+        for u in iter_bits(candidates & ~masks[pivot]):
+            if len(clique) + candidates.bit_count() <= len(best):
+                return
+            expand(clique + [u], candidates & masks[u], excluded & masks[u], masks, local)
+            candidates &= ~(1 << u)
+            excluded |= 1 << u
+
+    for v in order:
+        if bounds[v] + 1 > len(best):
+            local, masks, candidates, excluded = root_subproblem(v, neighbors, position)
+            expand([v], candidates, excluded, masks, local)
+
+    return tuple(vertices[v] for v in sorted(best))
+
+
+def clique_roots(graph):
+    """
+    The vertices in degeneracy order: the roots of the subproblems of iter_maximal_cliques.
+    Give every worker a slice of this list (roots=...) to split the enumeration without overlaps.
     Args:
         graph (dict): Graph as an adjacency list.
     Returns:
-        tuple: The largest clique found.
+        list: vertices of the graph.
     """
-    vertices = list(graph.keys())
-    n = len(vertices)
-    for k in range(n, 0, -1):
-        for subset in itertools.combinations(vertices, k):
-            if is_clique(graph, subset):
-                return subset
-    return None  # Return None if graph is empty
+    vertices, neighbors = index_graph(graph)
+    order, _ = degeneracy_order(neighbors)
+    return [vertices[v] for v in order]
+
+
+def iter_maximal_cliques(graph, min_size=1, roots=None):
+    """
+    Generate every maximal clique, one at a time as they are found (Bron–Kerbosch with Tomita pivoting).
+    Nothing is kept between cliques, so the output can be streamed to disk, and the caller can stop early
+    by breaking out of the loop (or closing the generator).
+    The search is split into one subproblem per vertex (see root_subproblem): the subproblem of v yields the
+    maximal cliques whose earliest vertex in degeneracy order is v, so every clique comes from exactly one root.
+    Args:
+        graph (dict): Graph as an adjacency list.
+        min_size (int): only yield cliques with at least this many vertices; branches that cannot reach it
+                        are cut, and so are the roots with too few later neighbours.
+        roots (iterable): only search the subproblems of these vertices (default: all of them), e.g. a slice of
+                          clique_roots(graph) per process.
+    Yields:
+        tuple: a maximal clique, its vertices in the order of the graph's keys.
+    """
+    vertices, neighbors = index_graph(graph)
+    order, core = degeneracy_order(neighbors)
+    position = inverse_order(order)
+    if roots is not None:
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        order = [index[vertex] for vertex in roots]
+
+    def expand(clique, candidates, excluded, masks):
+        # clique: local indices, below the root vertex
+        if not candidates:
+            if not excluded and 1 + len(clique) >= min_size:  # nothing can extend it: maximal
+                yield clique
+            return
+        if 1 + len(clique) + candidates.bit_count() < min_size:
+            return
+        pivot = max(iter_bits(candidates | excluded), key=lambda u: (candidates & masks[u]).bit_count())
+        for u in iter_bits(candidates & ~masks[pivot]):
+            yield from expand(clique + [u], candidates & masks[u], excluded & masks[u], masks)
+            candidates &= ~(1 << u)
+            excluded |= 1 << u
+
+    for v in order:
+        if core[v] + 1 < min_size or sum(position[u] > position[v] for u in neighbors[v]) + 1 < min_size:
+            continue
+        local, masks, candidates, excluded = root_subproblem(v, neighbors, position)
+        for clique in expand([], candidates, excluded, masks):
+            yield tuple(vertices[u] for u in sorted([v] + [local[i] for i in clique]))
 
 
 if __name__ == "__main__":
@@ -72,4 +280,7 @@ if __name__ == "__main__":
     plt.show()
     
     maximal_clique = find_maximal_clique(petersen_graph)
-    print(f"Maximum clique: {maximal_clique}")
\ No newline at end of file
+    print(f"Maximum clique: {maximal_clique}")
+
+    for clique in iter_maximal_cliques(graph, min_size=3):
+        print(f"Maximal clique: {clique}")
\ No newline at end of file
@@ -29,18 +29,19 @@ def bfs_maze_solver(maze, start, end):
     return None  # No path found
 
 
-maze = [
-    [0, 1, 0, 0, 0],
-    [0, 1, 0, 1, 0],
-    [0, 0, 0, 1, 0],
-    [1, 1, 0, 1, 0],
-    [0, 0, 0, 0, 0]
-]
-start = (0, 0)
-end = (4, 4)
+if __name__ == "__main__":
+    maze = [
+        [0, 1, 0, 0, 0],
+        [0, 1, 0, 1, 0],
+        [0, 0, 0, 1, 0],
+        [1, 1, 0, 1, 0],
+        [0, 0, 0, 0, 0]
+    ]
+    start = (0, 0)
+    end = (4, 4)
 
-path = bfs_maze_solver(maze, start, end)
-if path:
-    print("Path found:", path)
-else:
-    print("No path found.")
+    path = bfs_maze_solver(maze, start, end)
+    if path:
+        print("Path found:", path)
+    else:
+        print("No path found.")
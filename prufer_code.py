@@ -5,12 +5,15 @@ import heapq
 
 
 
-def tree_to_pruffer(V: int, edges: Dict[int, Set]) -> List[int]:
+def tree_to_pruffer(V: int, edges: List[List[int]]) -> List[int]:
+    """
+    edges: (parent, child) pairs of a tree rooted at one of the vertices 1..V
+    """
     adj_list = dict()
     for i in range(1, V+1):
         adj_list[i] = set()
     
-    for edge in edge_list:
+    for edge in edges:
         adj_list[edge[0]].add(edge[1])
 
     pruffer_code = []
@@ -79,6 +82,6 @@ if __name__ == "__main__":
     V=int(input())
     
     E = len(edge_list)
-    prufer_code = tree_to_pruffer(edge_list)
-    tree_ = prufer_to_tree(prufer_code)
+    prufer_code = tree_to_pruffer(V, edge_list)
+    tree_ = prufer_to_tree(V, prufer_code)
     print(tree_)
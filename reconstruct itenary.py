@@ -13,48 +13,55 @@ Approach:
     
 """
 
-from collections import defaultdict
 from typing import List
 
-import collections
-from typing import List
+from graph_labels import VertexLabels
 
 class Solution:
     def findItinerary(self, tickets: List[List[str]]) -> List[str]:
-        # Step 1: Build adjacency list and track degree of each node
-        adj = collections.defaultdict(list)
-        degree = collections.defaultdict(int)  # Track the degree of each node
+        # Step 1: Intern the airport codes in lexicographical order, so the integer ids sort like the codes
+        labels = VertexLabels(sorted({airport for ticket in tickets for airport in ticket}))
+
+        # Step 2: Build adjacency list and track degree of each node, on the integer ids
+        adj = [[] for _ in range(len(labels))]
+        degree = [0] * len(labels)  # Track the degree of each node
 
         for source, dest in tickets:
+            source, dest = labels.id_of(source), labels.id_of(dest)
             adj[source].append(dest)
             degree[source] += 1
             degree[dest] += 1  # Increase degree for both nodes
 
-        # Step 2: Sort adjacency list for lexicographical order traversal
-        for key in adj:
-            adj[key].sort()
+        # Step 3: Sort adjacency list in reverse, so pop() takes the lexicographically smallest destination in O(1)
+        for destinations in adj:
+            destinations.sort(reverse=True)
 
-        # Step 3: Explicitly check if all nodes have even degree
+        # Step 4: Explicitly check if all nodes have even degree
         odd_cntr=0
-        for node in degree:
-            if degree[node] % 2 != 0:  # Check if any node has an odd degree
+        for node_degree in degree:
+            if node_degree % 2 != 0:  # Check if any node has an odd degree
                 odd_cntr+=1
         if odd_cntr>2:
             print("Not valid eularian circuit")
             return []
         
+        if "JFK" not in labels:
+            return ["JFK"]  # no ticket leaves JFK, the itinerary is the start airport alone
+
         itinerary = []
 
         def dfs(at):
             while adj[at]:
-                next_dest = adj[at].pop(0)
+                next_dest = adj[at].pop()
                 dfs(next_dest)
             itinerary.append(at)
 
-        dfs("JFK")
-        return itinerary[::-1]
+        dfs(labels.id_of("JFK"))
+        return labels.labels_of(reversed(itinerary))
+
 
-itenary = Solution()
-tickets = [["MUC", "LHR"], ["JFK", "MUC"], ["SFO", "SJC"], ["LHR", "SFO"]]
-ans = itenary.findItinerary(tickets)
-print(ans)
+if __name__ == "__main__":
+    itenary = Solution()
+    tickets = [["MUC", "LHR"], ["JFK", "MUC"], ["SFO", "SJC"], ["LHR", "SFO"]]
+    ans = itenary.findItinerary(tickets)
+    print(ans)